@@ -7,19 +7,58 @@ or max_turns is reached.
 
 from __future__ import annotations
 
+import copy
+import functools
+import hashlib
+import io
 import json
 import logging
+import os
 import threading
-from collections.abc import Callable
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Protocol
+from types import MappingProxyType
+from typing import Any, Final, Protocol
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except
+    # clauses below catch parse failures from either backend.
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    _json_loads = json.loads  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 # Max tool output size in bytes before truncation
 _MAX_TOOL_OUTPUT = 50_000
 
+# Max worker threads for concurrently executed parallel-safe tool calls
+_MAX_PARALLEL_TOOLS = 8
+
+# Min seconds between on_stream calls while streaming (~60Hz). Deltas that
+# arrive faster are coalesced; the first delta is always sent immediately.
+_STREAM_FLUSH_INTERVAL = 0.016
+
+# Shared read-only stand-in for a tool-call delta without a "function" key
+_NO_FUNCTION: Mapping[str, Any] = MappingProxyType({})
+
+# Summary counters bumped per tool: tool name -> (Context attribute, predicate).
+# The file_write status line leads its result, so only a short prefix is
+# lowercased instead of the whole (up to 50KB) output.
+_FILE_COUNTERS: dict[str, tuple[str, Callable[[str], bool]]] = {
+    "file_read": ("files_read", lambda result: not result.startswith("Error")),
+    "file_write": ("files_written", lambda result: "written" in result[:128].lower()),
+}
+
+# Response cache: max entries and default TTL in seconds
+# (override the TTL with ZHI_RESPONSE_CACHE_TTL)
+_RESPONSE_CACHE_SIZE = 512
+_RESPONSE_CACHE_TTL = 300.0
+
 
 class Role(str, Enum):
     """Message roles for the conversation."""
@@ -30,6 +69,14 @@ class Role(str, Enum):
     TOOL = "tool"
 
 
+# Plain-str role values for building and matching messages; Role.X.value
+# goes through the Enum descriptor machinery on every access.
+ROLE_SYSTEM: Final[str] = Role.SYSTEM.value
+ROLE_USER: Final[str] = Role.USER.value
+ROLE_ASSISTANT: Final[str] = Role.ASSISTANT.value
+ROLE_TOOL: Final[str] = Role.TOOL.value
+
+
 class PermissionMode(str, Enum):
     """Permission modes for tool execution."""
 
@@ -51,6 +98,24 @@ class ToolLike(Protocol):
     def to_function_schema(self) -> dict[str, Any]: ...
 
 
+class ResponseLike(Protocol):
+    """Fields the agent loop reads from a buffered chat response."""
+
+    content: str | None
+    tool_calls: list[dict[str, Any]]
+    thinking: str | None
+    total_tokens: int
+
+
+class ChunkLike(Protocol):
+    """Fields the agent loop reads from a streamed chat chunk."""
+
+    delta_content: str
+    delta_thinking: str
+    tool_calls: list[dict[str, Any]]
+    usage: dict[str, int] | None
+
+
 class ClientLike(Protocol):
     """Minimal client interface for the agent loop."""
 
@@ -60,7 +125,7 @@ class ClientLike(Protocol):
         model: str,
         tools: list[dict[str, Any]] | None,
         thinking: bool,
-    ) -> Any: ...
+    ) -> ResponseLike: ...
 
     def chat_stream(
         self,
@@ -68,17 +133,17 @@ class ClientLike(Protocol):
         model: str,
         tools: list[dict[str, Any]] | None,
         thinking: bool,
-    ) -> Any: ...
+    ) -> Iterable[ChunkLike]: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """Request-scoped state for the agent loop."""
 
     config: Any
     client: ClientLike
     model: str
-    tools: dict[str, ToolLike]
+    tools: Mapping[str, ToolLike]
     tool_schemas: list[dict[str, Any]]
     permission_mode: PermissionMode
     conversation: list[dict[str, Any]] = field(default_factory=list)
@@ -107,18 +172,41 @@ class Context:
     # Sliding window: max messages sent to the LLM (0 = unlimited).
     # Keeps system prompt + initial user message + last N messages.
     max_context_messages: int = 0
+    # Serve byte-identical requests from an in-process response cache.
+    # Off unless ZHI_RESPONSE_CACHE=1; only useful for deterministic replays.
+    cache_enabled: bool = field(
+        default_factory=lambda: os.environ.get("ZHI_RESPONSE_CACHE") == "1"
+    )
 
 
 def safe_parse_args(raw_args: Any) -> dict[str, Any]:
     """Safely parse tool call arguments, returning empty dict on failure."""
+    # Arguments almost always arrive as a JSON string, so decode first and
+    # sort out the rare dict/garbage inputs only when that fails.
+    try:
+        parsed: dict[str, Any] = _json_loads(raw_args)
+        return parsed
+    except (TypeError, ValueError):
+        if isinstance(raw_args, dict):
+            return raw_args
+        if isinstance(raw_args, str):
+            return {"_raw": raw_args}
+        return {}
+
+
+def _parse_tool_args(raw_args: Any) -> dict[str, Any]:
+    """Decode tool call arguments for execution.
+
+    Unlike safe_parse_args, malformed JSON raises so the caller can report
+    it back to the model.  Argument-less calls (``"{}"``) skip the decoder.
+    """
+    if isinstance(raw_args, str):
+        if raw_args == "{}":
+            return {}
+        parsed: dict[str, Any] = _json_loads(raw_args)
+        return parsed
     if isinstance(raw_args, dict):
         return raw_args
-    if isinstance(raw_args, str):
-        try:
-            parsed: dict[str, Any] = json.loads(raw_args)
-            return parsed
-        except (json.JSONDecodeError, ValueError):
-            return {"_raw": raw_args}
     return {}
 
 
@@ -149,250 +237,464 @@ def _prune_for_api(context: Context) -> list[dict[str, Any]]:
     prefix_end = 0
     for i, msg in enumerate(conv):
         role = msg.get("role")
-        if role == Role.SYSTEM.value:
+        if role == ROLE_SYSTEM:
             prefix_end = i + 1
-        elif role == Role.USER.value and i <= prefix_end:
+        elif role == ROLE_USER and i <= prefix_end:
             prefix_end = i + 1
             break
         else:
             break
 
-    prefix = conv[:prefix_end]
-    rest = conv[prefix_end:]
-
-    keep = limit - len(prefix)
-    if keep <= 0 or keep >= len(rest):
+    # Work on absolute indices so only the kept messages are copied, not
+    # the whole history after the prefix.
+    n = len(conv)
+    if limit <= prefix_end:
         return conv
 
     # Walk forward from the tentative cut point until we hit an assistant
     # message, which marks the clean start of a turn group.
-    cut = len(rest) - keep
-    while cut < len(rest) and rest[cut].get("role") != Role.ASSISTANT.value:
+    cut = prefix_end + n - limit
+    while cut < n and conv[cut].get("role") != ROLE_ASSISTANT:
         cut += 1
 
-    if cut >= len(rest):
+    if cut >= n:
         return conv  # no clean boundary found — keep everything
 
-    return prefix + rest[cut:]
+    return conv[:prefix_end] + conv[cut:]
 
 
-@dataclass
+@dataclass(slots=True)
 class _TurnResult:
     """Result of a single agent turn (streaming or buffered)."""
 
     content: str | None = None
     tool_calls: list[dict[str, Any]] = field(default_factory=list)
     total_tokens: int = 0
+    thinking: str | None = None
+
+
+_response_cache: OrderedDict[str, tuple[float, _TurnResult]] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_ttl() -> float:
+    """Return the response cache TTL, honoring ZHI_RESPONSE_CACHE_TTL."""
+    raw = os.environ.get("ZHI_RESPONSE_CACHE_TTL")
+    if raw:
+        try:
+            return float(raw)
+        except ValueError:
+            logger.warning("Invalid ZHI_RESPONSE_CACHE_TTL '%s', using default", raw)
+    return _RESPONSE_CACHE_TTL
+
+
+def _response_cache_key(context: Context) -> str:
+    """Hash everything that determines the model's reply for this turn."""
+    payload = json.dumps(
+        {
+            "model": context.model,
+            "thinking": context.thinking_enabled,
+            "tools": context.tool_schemas,
+            "messages": _prune_for_api(context),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> _TurnResult | None:
+    """Return a copy of a fresh cached turn result, or None."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > _response_cache_ttl():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+    # A cached reply costs no tokens
+    return _TurnResult(
+        content=result.content,
+        tool_calls=copy.deepcopy(result.tool_calls),
+        thinking=result.thinking,
+    )
+
 
+def _cache_put(key: str, result: _TurnResult) -> None:
+    """Store a turn result, evicting the least recently used entries."""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), copy.deepcopy(result))
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
 
-def _do_turn_streaming(context: Context) -> _TurnResult:
-    """Execute a single turn using streaming, displaying tokens live."""
-    on_stream_start = getattr(context, "on_stream_start", None)
-    if on_stream_start:
-        on_stream_start()
 
-    content_parts: list[str] = []
-    thinking_parts: list[str] = []
-    # Accumulate tool call deltas by index
-    tc_accum: dict[int, dict[str, Any]] = {}
+def _replay_cached(
+    context: Context, result: _TurnResult, use_streaming: bool
+) -> _TurnResult:
+    """Fire the display callbacks for a cached turn as a live turn would."""
+    if use_streaming and context.on_stream_start:
+        context.on_stream_start()
+    if result.thinking and context.on_thinking:
+        context.on_thinking(result.thinking)
+    if result.content and context.on_stream:
+        context.on_stream(result.content)
+    return result
+
+
+def _do_turn_streaming(
+    context: Context, tools: list[dict[str, Any]] | None = None
+) -> _TurnResult:
+    """Execute a single turn using streaming, displaying tokens live.
+
+    *tools* is the schema list sent to the API; it is resolved from the
+    context when omitted.
+    """
+    if tools is None:
+        tools = context.tool_schemas or None
+    if context.on_stream_start:
+        context.on_stream_start()
+
+    content_buf = io.StringIO()
+    # Thinking is only kept when something will consume it
+    keep_thinking = context.on_thinking is not None or context.cache_enabled
+    thinking_buf = io.StringIO() if keep_thinking else None
+    # Accumulate tool call deltas in a dense list indexed by delta index;
+    # indices are small and contiguous, so gaps (None) are rare.
+    tc_accum: list[dict[str, Any] | None] = []
     total_tokens = 0
 
-    for chunk in context.client.chat_stream(
+    # Bind per-chunk lookups to locals; the loop runs once per token.
+    content_write = content_buf.write
+    thinking_write = thinking_buf.write if thinking_buf is not None else None
+    on_stream = context.on_stream
+    is_cancelled = context.cancel_event.is_set
+    # Content not yet handed to on_stream, and when it was last called
+    pending: list[str] = []
+    last_flush = float("-inf")
+
+    stream = context.client.chat_stream(
         messages=_prune_for_api(context),
         model=context.model,
-        tools=context.tool_schemas or None,
+        tools=tools,
         thinking=context.thinking_enabled,
-    ):
-        # Check cancellation during streaming
-        if context.cancel_event.is_set():
+    )
+    for chunk in stream:
+        # Check cancellation during streaming; close the stream right away
+        # so the HTTP response is released instead of waiting for GC.
+        if is_cancelled():
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
             raise AgentInterruptedError("Cancelled by user")
 
         # Thinking deltas
-        delta_thinking = getattr(chunk, "delta_thinking", "")
-        if delta_thinking:
-            thinking_parts.append(delta_thinking)
+        delta_thinking = chunk.delta_thinking
+        if delta_thinking and thinking_write is not None:
+            thinking_write(delta_thinking)
 
         # Content deltas — stream each token to UI
-        delta_content = getattr(chunk, "delta_content", "")
+        delta_content = chunk.delta_content
         if delta_content:
-            content_parts.append(delta_content)
-            if context.on_stream:
-                context.on_stream(delta_content)
+            content_write(delta_content)
+            if on_stream:
+                pending.append(delta_content)
+                now = time.monotonic()
+                if now - last_flush >= _STREAM_FLUSH_INTERVAL:
+                    on_stream("".join(pending))
+                    pending.clear()
+                    last_flush = now
+        elif pending and on_stream:
+            # Content is pausing (tool-call args or thinking); show it now
+            on_stream("".join(pending))
+            pending.clear()
+            last_flush = time.monotonic()
 
         # Tool call deltas — accumulate by index
-        chunk_tool_calls = getattr(chunk, "tool_calls", None) or []
-        for tc_delta in chunk_tool_calls:
+        for tc_delta in chunk.tool_calls or ():
             idx = tc_delta.get("index", 0)
-            if idx not in tc_accum:
-                tc_accum[idx] = {
-                    "id": tc_delta.get("id", ""),
+            if idx >= len(tc_accum):
+                tc_accum.extend([None] * (idx + 1 - len(tc_accum)))
+            entry = tc_accum[idx]
+            call_id = tc_delta.get("id")
+            if entry is None:
+                # name/arguments collect fragments; joined once at stream end
+                entry = tc_accum[idx] = {
+                    "id": call_id or "",
                     "type": "function",
-                    "function": {"name": "", "arguments": ""},
+                    "function": {"name": [], "arguments": []},
                 }
-            entry = tc_accum[idx]
-            if tc_delta.get("id"):
-                entry["id"] = tc_delta["id"]
-            fn = tc_delta.get("function", {})
-            if fn.get("name"):
-                entry["function"]["name"] += fn["name"]
-            if fn.get("arguments"):
-                entry["function"]["arguments"] += fn["arguments"]
+            elif call_id:
+                entry["id"] = call_id
+            fn = tc_delta.get("function") or _NO_FUNCTION
+            entry_fn = entry["function"]
+            name = fn.get("name")
+            if name:
+                entry_fn["name"].append(name)
+            arguments = fn.get("arguments")
+            if arguments:
+                entry_fn["arguments"].append(arguments)
 
         # Usage from final chunk
-        usage = getattr(chunk, "usage", None)
+        usage = chunk.usage
         if usage and isinstance(usage, dict):
             total_tokens = usage.get("total_tokens", 0)
 
+    # Deliver any content still held back by coalescing
+    if pending and on_stream:
+        on_stream("".join(pending))
+
     # Show thinking if accumulated
-    full_thinking = "".join(thinking_parts)
+    full_thinking = thinking_buf.getvalue() if thinking_buf is not None else ""
     if full_thinking and context.on_thinking:
         context.on_thinking(full_thinking)
 
-    content = "".join(content_parts) or None
-    tool_calls = [tc_accum[i] for i in sorted(tc_accum)]
+    content = content_buf.getvalue() or None
+    tool_calls = [tc for tc in tc_accum if tc is not None]
+    for tc in tool_calls:
+        fn = tc["function"]
+        fn["name"] = "".join(fn["name"])
+        fn["arguments"] = "".join(fn["arguments"])
 
     return _TurnResult(
         content=content,
         tool_calls=tool_calls,
         total_tokens=total_tokens,
+        thinking=full_thinking or None,
     )
 
 
-def _do_turn_buffered(context: Context) -> _TurnResult:
-    """Execute a single turn using buffered (non-streaming) API call."""
+def _do_turn_buffered(
+    context: Context, tools: list[dict[str, Any]] | None = None
+) -> _TurnResult:
+    """Execute a single turn using buffered (non-streaming) API call.
+
+    *tools* is the schema list sent to the API; it is resolved from the
+    context when omitted.
+    """
+    if tools is None:
+        tools = context.tool_schemas or None
     response = context.client.chat(
         messages=_prune_for_api(context),
         model=context.model,
-        tools=context.tool_schemas or None,
+        tools=tools,
         thinking=context.thinking_enabled,
     )
 
-    total_tokens = getattr(response, "total_tokens", 0)
+    total_tokens = response.total_tokens
 
     # Show thinking
-    thinking = getattr(response, "thinking", None)
+    thinking = response.thinking
     if thinking and context.on_thinking:
         context.on_thinking(thinking)
 
     # Show content
-    content = getattr(response, "content", None)
+    content = response.content
     if content and context.on_stream:
         context.on_stream(content)
 
-    tool_calls = getattr(response, "tool_calls", None) or []
+    tool_calls = response.tool_calls or []
 
     return _TurnResult(
         content=content,
         tool_calls=tool_calls,
         total_tokens=total_tokens,
+        thinking=thinking,
     )
 
 
-def _execute_tool_calls(context: Context, tool_calls: list[dict[str, Any]]) -> None:
-    """Execute tool calls and append results to conversation."""
+@functools.lru_cache(maxsize=128)
+def _unknown_tool_msg(name: str) -> str:
+    """Error text for a hallucinated tool name; models tend to repeat them."""
+    return f"Error: Unknown tool '{name}'"
+
+
+def _tool_msg(call_id: str, content: str) -> dict[str, Any]:
+    """Build a tool-result message for the conversation."""
+    return {"role": ROLE_TOOL, "tool_call_id": call_id, "content": content}
+
+
+def _assistant_msg(
+    content: str, tool_calls: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """Build an assistant message, with tool calls when given."""
+    if tool_calls is None:
+        return {"role": ROLE_ASSISTANT, "content": content}
+    return {"role": ROLE_ASSISTANT, "content": content, "tool_calls": tool_calls}
+
+
+def _cap_output(result: str) -> str:
+    """Cap tool output at _MAX_TOOL_OUTPUT bytes of UTF-8."""
+    if result.isascii():
+        # One byte per character, so the str can be measured and sliced as-is
+        size = len(result)
+        if size <= _MAX_TOOL_OUTPUT:
+            return result
+        head = result[:_MAX_TOOL_OUTPUT]
+    else:
+        # UTF-8 uses at most 4 bytes per character
+        if len(result) * 4 <= _MAX_TOOL_OUTPUT:
+            return result
+        data = result.encode("utf-8", "replace")
+        size = len(data)
+        if size <= _MAX_TOOL_OUTPUT:
+            return result
+        head = data[:_MAX_TOOL_OUTPUT].decode("utf-8", "ignore")
+    return f"{head}\n[truncated, showing first {_MAX_TOOL_OUTPUT} of {size} bytes]"
+
+
+def _run_tool(
+    context: Context, tool: ToolLike, func_name: str, args: dict[str, Any]
+) -> str:
+    """Execute a single tool, capping its output and capturing errors."""
+    if context.cancel_event.is_set():
+        raise AgentInterruptedError("Cancelled by user")
+    try:
+        result = _cap_output(tool.execute(**args))
+    except Exception as e:
+        logger.exception("Tool %s failed", func_name)
+        result = f"Error executing {func_name}: {e}"
+    return result
+
+
+def _execute_tool_calls(
+    context: Context, tool_calls: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Execute tool calls and return their tool-result messages.
+
+    Unknown tools and argument parsing are resolved in a first pass.  Calls
+    then run in order: consecutive tools marked ``parallel_safe`` run
+    concurrently on a thread pool, and any other tool is a barrier that runs
+    alone, after everything before it has finished.  Risky tools ask for
+    permission right before they run and never join a parallel group.
+    Start/end callbacks always arrive as adjacent pairs in call order, and
+    results are returned in the original call order.  The conversation is
+    not touched, so an interrupted batch leaves no partial results behind.
+    """
     # Notify tool total for step counter
     if context.on_tool_total:
         context.on_tool_total(len(tool_calls))
 
+    tools = context.tools
+    is_cancelled = context.cancel_event.is_set
+    on_tool_start = context.on_tool_start
+    on_tool_end = context.on_tool_end
+    # Risky tools are only gated in approve mode; resolve that once per batch
+    on_permission = (
+        context.on_permission
+        if context.permission_mode == PermissionMode.APPROVE
+        else None
+    )
+    # Tool results are collected locally; the caller adds them to the
+    # conversation in one extend() once the whole batch has finished.
+    tool_msgs: list[dict[str, Any]] = []
+    append_message = tool_msgs.append
+
+    def groupable(tool: ToolLike) -> bool:
+        # A tool that must prompt first cannot start ahead of its turn
+        if tool.risky and on_permission:
+            return False
+        return bool(getattr(tool, "parallel_safe", False))
+
+    # Each entry is (call, func_name, tool, args, result); tool is None
+    # when the result was decided without executing anything.
+    entries: list[tuple[dict[str, Any], str, ToolLike | None, dict[str, Any], str]] = []
     for call in tool_calls:
-        # Check for cancellation between tool calls
-        if context.cancel_event.is_set():
-            raise AgentInterruptedError("Cancelled by user")
-
         func_name = call["function"]["name"]
-        call_id = call["id"]
 
         # Unknown tool
-        if func_name not in context.tools:
+        tool = tools.get(func_name)
+        if tool is None:
             logger.warning("Unknown tool requested: %s", func_name)
-            context.conversation.append(
-                {
-                    "role": Role.TOOL.value,
-                    "tool_call_id": call_id,
-                    "content": f"Error: Unknown tool '{func_name}'",
-                }
-            )
-            continue
-
-        tool = context.tools[func_name]
-
-        # Permission check
-        if (
-            tool.risky
-            and context.permission_mode == PermissionMode.APPROVE
-            and context.on_permission
-            and not context.on_permission(tool, call)
-        ):
-            context.conversation.append(
-                {
-                    "role": Role.TOOL.value,
-                    "tool_call_id": call_id,
-                    "content": "Permission denied by user",
-                }
-            )
+            entries.append((call, func_name, None, {}, _unknown_tool_msg(func_name)))
             continue
 
         # Parse arguments
         try:
-            raw_args = call["function"]["arguments"]
-            if isinstance(raw_args, str):
-                args = json.loads(raw_args)
-            elif isinstance(raw_args, dict):
-                args = raw_args
-            else:
-                args = {}
+            args = _parse_tool_args(call["function"]["arguments"])
         except (json.JSONDecodeError, TypeError) as parse_err:
             logger.warning("Failed to parse args for %s: %s", func_name, parse_err)
-            context.conversation.append(
-                {
-                    "role": Role.TOOL.value,
-                    "tool_call_id": call_id,
-                    "content": f"Error: Invalid JSON in tool arguments: {parse_err}",
-                }
+            entries.append(
+                (
+                    call,
+                    func_name,
+                    None,
+                    {},
+                    f"Error: Invalid JSON in tool arguments: {parse_err}",
+                )
             )
             continue
 
-        # Notify tool start
-        if context.on_tool_start:
-            context.on_tool_start(func_name, args)
-
-        # Execute tool
-        try:
-            result = tool.execute(**args)
-            # Cap output at 50KB
-            if len(result) > _MAX_TOOL_OUTPUT:
-                truncated_size = len(result)
-                result = (
-                    result[:_MAX_TOOL_OUTPUT]
-                    + "\n[truncated, showing first "
-                    + f"{_MAX_TOOL_OUTPUT} of {truncated_size} chars]"
-                )
-        except Exception as e:
-            logger.exception("Tool %s failed", func_name)
-            result = f"Error executing {func_name}: {e}"
-
-        # Notify tool end
-        if context.on_tool_end:
-            context.on_tool_end(func_name, result)
-
-        # Count successful tool uses
-        if not result.startswith("Error"):
-            context.tool_use_count += 1
-
-        # Count files for summary
-        if func_name == "file_read" and not result.startswith("Error"):
-            context.files_read += 1
-        elif func_name == "file_write" and "written" in result.lower():
-            context.files_written += 1
-
-        # Append tool result to conversation
-        context.conversation.append(
-            {
-                "role": Role.TOOL.value,
-                "tool_call_id": call_id,
-                "content": result,
-            }
-        )
+        entries.append((call, func_name, tool, args, ""))
+
+    futures: dict[int, Future[str]] = {}
+    pool: ThreadPoolExecutor | None = None
+    try:
+        for i, (call, func_name, pending, args, result) in enumerate(entries):
+            if pending is not None and i not in futures:
+                # Check for cancellation between tool calls
+                if is_cancelled():
+                    raise AgentInterruptedError("Cancelled by user")
+
+                # Permission check, just before the tool would run
+                if pending.risky and on_permission and not on_permission(pending, call):
+                    pending = None
+                    result = "Permission denied by user"
+                elif groupable(pending):
+                    # Dispatch this call with the parallel-safe calls that
+                    # follow it, up to the next tool that must run on its own
+                    group = [(i, pending)]
+                    for j in range(i + 1, len(entries)):
+                        next_tool = entries[j][2]
+                        if next_tool is None:
+                            continue
+                        if not groupable(next_tool):
+                            break
+                        group.append((j, next_tool))
+                    if len(group) > 1:
+                        if pool is None:
+                            pool = ThreadPoolExecutor(
+                                max_workers=_MAX_PARALLEL_TOOLS,
+                                thread_name_prefix="zhi-tool",
+                            )
+                        for j, group_tool in group:
+                            _, group_name, _, group_args, _ = entries[j]
+                            futures[j] = pool.submit(
+                                _run_tool, context, group_tool, group_name, group_args
+                            )
+
+            if pending is not None:
+                # Notify tool start; grouped calls report when collected so
+                # the UI always sees a start immediately followed by its end
+                if on_tool_start:
+                    on_tool_start(func_name, args)
+                if i in futures:
+                    result = futures.pop(i).result()
+                else:
+                    result = _run_tool(context, pending, func_name, args)
+
+                # Notify tool end
+                if on_tool_end:
+                    on_tool_end(func_name, result)
+
+                # Count successful tool uses
+                if not result.startswith("Error"):
+                    context.tool_use_count += 1
+
+                # Count files for summary
+                counter = _FILE_COUNTERS.get(func_name)
+                if counter is not None and counter[1](result):
+                    setattr(context, counter[0], getattr(context, counter[0]) + 1)
+
+            append_message(_tool_msg(call["id"], result))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    return tool_msgs
 
 
 def run(context: Context) -> str | None:
@@ -402,6 +704,8 @@ def run(context: Context) -> str | None:
     Uses streaming when available for token-by-token display.
     """
     use_streaming = _can_stream(context)
+    # Tool schemas are fixed for the whole run; resolve the API arg once
+    tools_arg = context.tool_schemas or None
 
     for turn in range(context.max_turns):
         logger.debug("Agent turn %d/%d", turn + 1, context.max_turns)
@@ -413,18 +717,30 @@ def run(context: Context) -> str | None:
         if context.on_waiting:
             context.on_waiting(context.model)
 
-        # Execute turn (streaming or buffered)
-        if use_streaming:
+        cache_key = _response_cache_key(context) if context.cache_enabled else None
+        cached = _cache_get(cache_key) if cache_key else None
+
+        # Execute turn (cached, streaming or buffered)
+        if cached is not None:
+            if context.on_waiting_done:
+                context.on_waiting_done()
+            result = _replay_cached(context, cached, use_streaming)
+        elif use_streaming:
             # Clear waiting before streaming starts (first token will arrive soon)
             if context.on_waiting_done:
                 context.on_waiting_done()
-            result = _do_turn_streaming(context)
+            result = _do_turn_streaming(context, tools_arg)
         else:
-            result = _do_turn_buffered(context)
+            result = _do_turn_buffered(context, tools_arg)
             # Clear waiting indicator now that response has arrived
             if context.on_waiting_done:
                 context.on_waiting_done()
 
+        # Replies that call tools are never cached: replaying one would
+        # re-run the tools against whatever state they find now
+        if cache_key is not None and cached is None and not result.tool_calls:
+            _cache_put(cache_key, result)
+
         # Track tokens
         context.session_tokens += result.total_tokens
 
@@ -435,32 +751,22 @@ def run(context: Context) -> str | None:
         if not tool_calls:
             # Append assistant's final message to conversation for multi-turn context
             if content:
-                context.conversation.append(
-                    {
-                        "role": Role.ASSISTANT.value,
-                        "content": content,
-                    }
-                )
+                context.conversation.append(_assistant_msg(content))
             return content
 
-        # Build assistant message with tool calls
-        assistant_msg: dict[str, Any] = {
-            "role": Role.ASSISTANT.value,
-            "content": content or "",
-            "tool_calls": tool_calls,
-        }
-        context.conversation.append(assistant_msg)
-
-        # Execute tool calls — checkpoint conversation length so we can
-        # roll back to a consistent state if interrupted mid-execution.
-        checkpoint = len(context.conversation)
+        # Append assistant message with tool calls
+        conversation = context.conversation
+        conversation.append(_assistant_msg(content or "", tool_calls))
+
+        # Tool results are only added once the whole batch has run.
         try:
-            _execute_tool_calls(context, tool_calls)
+            tool_msgs = _execute_tool_calls(context, tool_calls)
         except AgentInterruptedError:
-            # Remove the partially-appended tool results AND the assistant
-            # message that references them, so the conversation stays valid.
-            del context.conversation[checkpoint - 1 :]
+            # Drop the assistant message whose tool_calls will never get
+            # results, so the conversation stays valid.
+            conversation.pop()
             raise
+        conversation.extend(tool_msgs)
 
     # Max turns reached
     logger.warning("Agent reached max_turns (%d)", context.max_turns)
@@ -10,13 +10,26 @@ import logging
 import os
 import sys
 import time
+from types import MappingProxyType
 from typing import Any
 
-from zhi.agent import safe_parse_args
 from zhi.i18n import CHAT_SYSTEM_PROMPT, prepend_preamble, set_language, t
 
 logger = logging.getLogger(__name__)
 
+# Accepted config log_level names; anything else falls back to WARNING
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Root handlers installed by _setup_logging, to tell a re-level from a setup
+_log_handlers: list[logging.Handler] = []
+
 
 def _build_parser() -> argparse.ArgumentParser:
     """Build the argument parser."""
@@ -51,6 +64,11 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help=t("cli.nocolor_help"),
     )
+    parser.add_argument(
+        "--no-tools",
+        action="store_true",
+        help=t("cli.notools_help"),
+    )
     parser.add_argument(
         "--language",
         type=str,
@@ -87,6 +105,9 @@ def _build_parser() -> argparse.ArgumentParser:
 def _setup_logging(debug: bool = False, *, config_level: str | None = None) -> None:
     """Configure logging level.
 
+    The root handler is installed on the first call; later calls (once the
+    config file has been read) only adjust the level.
+
     Args:
         debug: If True, force DEBUG level (overrides config_level).
         config_level: Log level from config (e.g. "INFO", "WARNING").
@@ -94,14 +115,19 @@ def _setup_logging(debug: bool = False, *, config_level: str | None = None) -> N
     if debug:
         level = logging.DEBUG
     elif config_level:
-        level = getattr(logging, config_level.upper(), logging.WARNING)
+        level = _LOG_LEVELS.get(config_level.upper(), logging.WARNING)
     else:
         level = logging.WARNING
+    root = logging.getLogger()
+    if _log_handlers and root.handlers == _log_handlers:
+        root.setLevel(level)
+        return
     logging.basicConfig(
         level=level,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         force=True,
     )
+    _log_handlers[:] = root.handlers
 
 
 def _build_context(
@@ -114,9 +140,16 @@ def _build_context(
     user_message: str | None = None,
     max_turns: int | None = None,
     output_dir: str | None = None,
+    skills: dict[str, Any] | None = None,
+    client: Any | None = None,
 ) -> Any:
-    """Build an agent Context from config and options."""
-    from zhi.agent import Context, PermissionMode
+    """Build an agent Context from config and options.
+
+    Pass ``skills`` when the caller has already run ``discover_skills()``
+    so the skill directories are not scanned a second time, and ``client``
+    to reuse an existing API client (and its open connections).
+    """
+    from zhi.agent import Context, PermissionMode, safe_parse_args
     from zhi.client import Client
     from zhi.skills import _default_user_skills_dir, discover_skills
     from zhi.tools import create_default_registry, register_skill_tools
@@ -138,17 +171,8 @@ def _build_context(
         return answer.strip()
 
     effective_output_dir = output_dir or config.output_dir
-    client = Client(api_key=config.api_key)
-    registry = create_default_registry(
-        output_dir=effective_output_dir,
-        ask_user_callback=_ask_user_cli,
-    )
-
-    # Register tools that need runtime dependencies.
-    # ShellTool's own callback auto-approves because the agent loop already
-    # gates risky tools through on_permission (no double prompting).
-    registry.register(OcrTool(client=client))
-    registry.register(ShellTool(permission_callback=lambda _cmd, _destructive: True))
+    if client is None:
+        client = Client(api_key=config.api_key)
 
     # Build permission callback (shared with skills via closure)
     def on_permission(tool: Any, call: dict[str, Any]) -> bool:
@@ -170,40 +194,62 @@ def _build_context(
             return mode
         return PermissionMode.APPROVE
 
-    # Register discovered skills as callable tools
-    skills = discover_skills()
-    register_skill_tools(
-        registry,
-        skills,
-        client,
-        on_permission=on_permission,
-        permission_mode_getter=permission_mode_getter,
-        on_ask_user=_ask_user_cli,
-        base_output_dir=config.output_dir,
-        on_tool_start=ui.show_tool_start,
-        on_tool_end=ui.show_tool_end,
-        on_tool_total=ui.set_tool_total,
-        on_trace_depth=ui.set_trace_depth,
-        on_skill_summary=ui.show_skill_summary,
-    )
+    if tool_names == []:
+        # Chat-only context: no registry, no skill discovery
+        tools: MappingProxyType[str, Any] = MappingProxyType({})
+        tool_schemas: list[dict[str, Any]] = []
+    else:
+        registry = create_default_registry(
+            output_dir=effective_output_dir,
+            ask_user_callback=_ask_user_cli,
+        )
 
-    # Register skill_create so the LLM can create new user skills
-    user_skills_dir = _default_user_skills_dir()
-    base_tool_names = [n for n in registry.list_names() if not n.startswith("skill_")]
-    registry.register(
-        SkillCreateTool(
-            user_skills_dir,
-            base_tool_names,
-            default_model=config.skill_model,
+        # Register tools that need runtime dependencies.
+        # ShellTool's own callback auto-approves because the agent loop already
+        # gates risky tools through on_permission (no double prompting).
+        registry.register(OcrTool(client=client))
+        registry.register(
+            ShellTool(permission_callback=lambda _cmd, _destructive: True)
         )
-    )
 
-    if tool_names is not None:
-        tools = registry.filter_by_names(tool_names)
-        tool_schemas = registry.to_schemas_filtered(tool_names)
-    else:
-        tools = {t.name: t for t in registry.list_tools()}
-        tool_schemas = registry.to_schemas()
+        # Register discovered skills as callable tools
+        if skills is None:
+            skills = discover_skills()
+        register_skill_tools(
+            registry,
+            skills,
+            client,
+            on_permission=on_permission,
+            permission_mode_getter=permission_mode_getter,
+            on_ask_user=_ask_user_cli,
+            base_output_dir=config.output_dir,
+            on_tool_start=ui.show_tool_start,
+            on_tool_end=ui.show_tool_end,
+            on_tool_total=ui.set_tool_total,
+            on_trace_depth=ui.set_trace_depth,
+            on_skill_summary=ui.show_skill_summary,
+        )
+
+        # Register skill_create so the LLM can create new user skills
+        user_skills_dir = _default_user_skills_dir()
+        base_tool_names = [
+            n for n in registry.list_names() if not n.startswith("skill_")
+        ]
+        registry.register(
+            SkillCreateTool(
+                user_skills_dir,
+                base_tool_names,
+                default_model=config.skill_model,
+            )
+        )
+
+        # The tool map is fixed for the context's lifetime; expose it read-only
+        if tool_names is not None:
+            tools = MappingProxyType(registry.filter_by_names(tool_names))
+            tool_schemas = registry.to_schemas_filtered(tool_names)
+        else:
+            tools = MappingProxyType({t.name: t for t in registry.list_tools()})
+            tool_schemas = registry.to_schemas()
 
     conversation: list[dict[str, Any]] = []
     if system_prompt:
@@ -246,13 +292,21 @@ def _require_api_key(config: Any) -> bool:
     return True
 
 
-def _run_oneshot(config: Any, ui: Any, message: str) -> None:
-    """Run a single message through the agent and exit."""
+def _run_oneshot(config: Any, ui: Any, message: str, *, tools: bool = True) -> None:
+    """Run a single message through the agent and exit.
+
+    With ``tools=False`` the context is built without any tools, skipping
+    registry construction and skill discovery for chat-only questions.
+    """
     from zhi.agent import run as agent_run
     from zhi.errors import ApiError
 
     context = _build_context(
-        config, ui, system_prompt=CHAT_SYSTEM_PROMPT, user_message=message
+        config,
+        ui,
+        tool_names=None if tools else [],
+        system_prompt=CHAT_SYSTEM_PROMPT,
+        user_message=message,
     )
     t0 = time.monotonic()
     try:
@@ -295,15 +349,15 @@ def _run_skill(config: Any, ui: Any, skill_name: str, files: list[str]) -> None:
 
     # Read file content upfront and inject into user message (like Claude Code).
     user_content = f"Run the '{skill_name}' skill."
+    client = None
     if files:
         from zhi.client import Client
-        from zhi.files import _extract_one
+        from zhi.files import _extract_many
 
         client = Client(api_key=config.api_key)
+        paths = [Path(file_path).expanduser().resolve() for file_path in files]
         file_sections = []
-        for file_path in files:
-            path = Path(file_path).expanduser().resolve()
-            att = _extract_one(path, client)
+        for att in _extract_many(paths, client):
             if att.error:
                 file_sections.append(
                     f"--- File: {att.filename} ---\n[Error: {att.error}]"
@@ -322,6 +376,8 @@ def _run_skill(config: Any, ui: Any, skill_name: str, files: list[str]) -> None:
         user_message=user_content,
         max_turns=skill.max_turns,
         output_dir=skill_output_dir,
+        skills=skills,
+        client=client,
     )
     t0 = time.monotonic()
     try:
@@ -346,13 +402,13 @@ def _run_skill(config: Any, ui: Any, skill_name: str, files: list[str]) -> None:
         )
 
 
-def _run_pipe(config: Any, ui: Any) -> None:
+def _run_pipe(config: Any, ui: Any, *, tools: bool = True) -> None:
     """Read stdin and run through the agent."""
     stdin_text = sys.stdin.read().strip()
     if not stdin_text:
         print(t("cli.no_stdin"))
         sys.exit(1)
-    _run_oneshot(config, ui, stdin_text)
+    _run_oneshot(config, ui, stdin_text, tools=tools)
 
 
 def _run_update() -> None:
@@ -383,7 +439,9 @@ def _maybe_check_update(config: Any) -> None:
     # Clean up leftover .old exe from previous update
     cleanup_old_exe()
 
-    result = check_for_update(__version__)
+    # Never block startup on the network; a stale or missing cache is
+    # refreshed in the background for the next launch.
+    result = check_for_update(__version__, background=True)
     if result is not None:
         print(t("update.available", current=result["current"], latest=result["latest"]))
 
@@ -397,16 +455,29 @@ def _run_repl(config: Any, ui: Any) -> None:
     session.run()
 
 
+def _print_version() -> None:
+    """Print the installed zhi version."""
+    from zhi import __version__
+
+    print(f"zhi {__version__}")
+
+
 def main(argv: list[str] | None = None) -> None:
     """Main entry point for the zhi CLI."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Bare `zhi --version` needs neither the parser nor its i18n help text
+    if argv == ["--version"]:
+        _print_version()
+        return
+
     parser = _build_parser()
     args = parser.parse_args(argv)
 
     # Handle --version
     if args.version:
-        from zhi import __version__
-
-        print(f"zhi {__version__}")
+        _print_version()
         return
 
     # Handle --no-color
@@ -449,6 +520,8 @@ def main(argv: list[str] | None = None) -> None:
 
     # Handle 'run' subcommand
     if args.subcommand == "run":
+        if args.no_tools:
+            parser.error(t("cli.notools_mode"))
         if not _require_api_key(config):
             sys.exit(1)
         _run_skill(config, ui, args.skill, args.files)
@@ -458,17 +531,19 @@ def main(argv: list[str] | None = None) -> None:
     if args.command:
         if not _require_api_key(config):
             sys.exit(1)
-        _run_oneshot(config, ui, args.command)
+        _run_oneshot(config, ui, args.command, tools=not args.no_tools)
         return
 
     # Detect pipe mode
     if not sys.stdin.isatty():
         if not _require_api_key(config):
             sys.exit(1)
-        _run_pipe(config, ui)
+        _run_pipe(config, ui, tools=not args.no_tools)
         return
 
-    # Default: launch REPL
+    # Default: launch REPL (skills run from it need the full tool set)
+    if args.no_tools:
+        parser.error(t("cli.notools_mode"))
     if not config.has_api_key:
         from zhi.config import run_wizard
 
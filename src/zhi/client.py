@@ -4,19 +4,44 @@ from __future__ import annotations
 
 import logging
 import random
+import re
+import sys
 import time
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-
-from zhipuai import ZhipuAI
+from typing import TYPE_CHECKING, Any
 
 from zhi.errors import ApiError
 
+if TYPE_CHECKING:
+    from zhipuai import ZhipuAI
+
 logger = logging.getLogger(__name__)
 
 _MAX_OCR_FILE_SIZE = 20 * 1024 * 1024  # 20MB
+_RETRY_BASE_WAIT = 1.0  # seconds
+_RETRY_MAX_WAIT = 30.0  # seconds
+
+# Error classification: HTTP status -> kind, and message keywords -> kind.
+# When several kinds apply, _classify_error picks by the order of _ERROR_KINDS.
+_ERROR_KINDS = ("auth", "rate", "server", "timeout", "connection")
+_STATUS_KINDS = {
+    401: "auth",
+    403: "auth",
+    429: "rate",
+    500: "server",
+    502: "server",
+    503: "server",
+}
+_ERROR_KEYWORDS_RE = re.compile(
+    r"(?P<auth>unauthorized|invalid api key|authentication)"
+    r"|(?P<rate>rate limit)"
+    r"|(?P<server>server error)"
+    r"|(?P<timeout>timeout|timed out)"
+    r"|(?P<connection>connection)",
+    re.IGNORECASE,
+)
 _SUPPORTED_EXTENSIONS = {
     ".pdf",
     ".png",
@@ -33,7 +58,21 @@ _SUPPORTED_EXTENSIONS = {
 }
 
 
-@dataclass
+def __getattr__(name: str) -> Any:
+    """Import the zhipuai SDK on first use of ``zhi.client.ZhipuAI``.
+
+    The SDK takes ~200ms to import; commands that never build a Client
+    (``--version``, ``--help``, ``update``) should not pay for it.
+    """
+    if name == "ZhipuAI":
+        from zhipuai import ZhipuAI
+
+        globals()["ZhipuAI"] = ZhipuAI
+        return ZhipuAI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(slots=True, kw_only=True)
 class ChatResponse:
     """Parsed chat completion response."""
 
@@ -44,10 +83,11 @@ class ChatResponse:
     completion_tokens: int = 0
     total_tokens: int = 0
     finish_reason: str = ""
-    raw: Any = None
+    # The SDK response object, for callers that need fields not parsed here
+    raw: Any = field(default=None, repr=False)
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ChatChunk:
     """A single chunk from streaming response."""
 
@@ -96,6 +136,23 @@ class ServerError(ClientError):
         super().__init__(message, code="SERVER_ERROR", retryable=True)
 
 
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Return the Retry-After delay carried by an HTTP error, if any.
+
+    Only the delta-seconds form is understood; HTTP dates are ignored.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
 class Client:
     """Zhipu API client with retry and streaming support."""
 
@@ -105,7 +162,10 @@ class Client:
         max_retries: int = 3,
         timeout: float = 60.0,
     ) -> None:
-        self._sdk = ZhipuAI(api_key=api_key)
+        # Resolved through the module so the lazy import (and test patches
+        # of zhi.client.ZhipuAI) apply.
+        sdk_cls: type[ZhipuAI] = sys.modules[__name__].ZhipuAI
+        self._sdk = sdk_cls(api_key=api_key)
         self._max_retries = max_retries
         self._timeout = timeout
 
@@ -154,8 +214,16 @@ class Client:
             return self._sdk.chat.completions.create(**kwargs)
 
         stream = self._call_with_retry(_call)
-        for chunk_raw in stream:
-            yield self._parse_chunk(chunk_raw)
+        try:
+            for chunk_raw in stream:
+                yield self._parse_chunk(chunk_raw)
+        finally:
+            # Closing this generator (e.g. on cancel) must release the HTTP
+            # connection; the SDK's StreamResponse has no close() of its own
+            response = getattr(stream, "response", None)
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
 
     def validate_key(self) -> bool:
         """Quick validation of API key by making a minimal API call."""
@@ -176,6 +244,14 @@ class Client:
         Supports: PDF, images, and office documents (.xlsx, .docx, etc.).
         Rejects files over 20MB.
         """
+        # Check the suffix first: it needs no filesystem access
+        if file_path.suffix.lower() not in _SUPPORTED_EXTENSIONS:
+            raise ClientError(
+                f"Unsupported file type: {file_path.suffix}. "
+                f"Supported: {', '.join(sorted(_SUPPORTED_EXTENSIONS))}",
+                code="UNSUPPORTED_FORMAT",
+            )
+
         try:
             if not file_path.exists():
                 raise ClientError(f"File not found: {file_path}")
@@ -191,14 +267,9 @@ class Client:
                 code="FILE_TOO_LARGE",
             )
 
-        if file_path.suffix.lower() not in _SUPPORTED_EXTENSIONS:
-            raise ClientError(
-                f"Unsupported file type: {file_path.suffix}. "
-                f"Supported: {', '.join(sorted(_SUPPORTED_EXTENSIONS))}",
-                code="UNSUPPORTED_FORMAT",
-            )
-
         def _call() -> Any:
+            # The SDK hands the open file to httpx, which streams the
+            # multipart body from it in chunks; it is never read whole.
             with open(file_path, "rb") as f:
                 result = self._sdk.files.create(file=f, purpose="file-extract")
             content = self._sdk.files.content(file_id=result.id)
@@ -227,7 +298,16 @@ class Client:
         return self.file_extract(file_path)
 
     def _call_with_retry(self, fn: Any) -> Any:
-        """Execute with exponential backoff retry for transient errors."""
+        """Execute with backoff retry for transient errors.
+
+        Waits use decorrelated jitter (or the server's Retry-After) so
+        rate-limited clients do not retry in lockstep, and no retry is
+        attempted once its wait would run past the client's timeout.  That
+        budget starts at the first failure, so a slow call that eventually
+        fails is still retried.
+        """
+        deadline: float | None = None
+        wait = _RETRY_BASE_WAIT
         for attempt in range(self._max_retries + 1):
             try:
                 return fn()
@@ -237,7 +317,21 @@ class Client:
                 error = self._classify_error(exc)
                 if not error.retryable or attempt == self._max_retries:
                     raise error from exc
-                wait = min(2**attempt + random.uniform(0, 1), 30)
+                retry_after = _retry_after_seconds(exc)
+                if retry_after is not None:
+                    wait = min(retry_after, _RETRY_MAX_WAIT)
+                else:
+                    wait = min(
+                        random.uniform(_RETRY_BASE_WAIT, wait * 3), _RETRY_MAX_WAIT
+                    )
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self._timeout
+                if now + wait > deadline:
+                    logger.info(
+                        "Retry budget of %.0fs exhausted: %s", self._timeout, error
+                    )
+                    raise error from exc
                 logger.info(
                     "Retry %d/%d after %.1fs: %s",
                     attempt + 1,
@@ -250,28 +344,29 @@ class Client:
 
     def _classify_error(self, error: Exception) -> ClientError:
         """Classify SDK/HTTP errors into typed errors."""
-        error_str = str(error).lower()
+        message = str(error)
         status_code = getattr(error, "status_code", None)
         code_attr = getattr(error, "code", None)
         error_code = status_code if status_code is not None else code_attr
 
-        if (
-            error_code in (401, 403)
-            or "unauthorized" in error_str
-            or "invalid api key" in error_str
-            or "authentication" in error_str
-        ):
-            return AuthenticationError()
-        if error_code == 429 or "rate limit" in error_str:
-            return RateLimitError()
-        if error_code in (500, 502, 503) or "server error" in error_str:
-            return ServerError()
-        if "timeout" in error_str or "timed out" in error_str:
-            return ClientError("Request timed out", code="TIMEOUT", retryable=True)
-        if "connection" in error_str:
+        # One pass over the message collects every matching kind
+        kinds = {m.lastgroup for m in _ERROR_KEYWORDS_RE.finditer(message)}
+        if isinstance(error_code, int) and error_code in _STATUS_KINDS:
+            kinds.add(_STATUS_KINDS[error_code])
+
+        if kinds:
+            kind = next(k for k in _ERROR_KINDS if k in kinds)
+            if kind == "auth":
+                return AuthenticationError()
+            if kind == "rate":
+                return RateLimitError()
+            if kind == "server":
+                return ServerError()
+            if kind == "timeout":
+                return ClientError("Request timed out", code="TIMEOUT", retryable=True)
             return ClientError("Connection failed", code="CONNECTION", retryable=True)
 
-        return ClientError(str(error))
+        return ClientError(message)
 
     def _parse_response(self, raw: Any) -> ChatResponse:
         """Parse SDK response into ChatResponse."""
@@ -322,22 +417,20 @@ class Client:
         delta = chunk_raw.choices[0].delta
 
         tool_calls_raw: list[dict[str, Any]] = []
-        if hasattr(delta, "tool_calls") and delta.tool_calls:
-            for tc in delta.tool_calls:
+        tool_call_deltas = getattr(delta, "tool_calls", None)
+        if tool_call_deltas:
+            for tc in tool_call_deltas:
+                # Look the function up once; the SDK always defines
+                # name/arguments on it (possibly None mid-stream)
+                fn = tc.function
                 tool_calls_raw.append(
                     {
-                        "index": tc.index if hasattr(tc, "index") else 0,
+                        "index": getattr(tc, "index", 0),
                         "id": getattr(tc, "id", None),
                         "type": "function",
                         "function": {
-                            "name": (
-                                getattr(tc.function, "name", "") if tc.function else ""
-                            ),
-                            "arguments": (
-                                getattr(tc.function, "arguments", "")
-                                if tc.function
-                                else ""
-                            ),
+                            "name": fn.name if fn else "",
+                            "arguments": fn.arguments if fn else "",
                         },
                     }
                 )
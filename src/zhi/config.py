@@ -6,15 +6,13 @@ Priority: env vars > config file > defaults.
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import platformdirs
-import yaml
-
 from zhi.i18n import set_language, t
 
 logger = logging.getLogger(__name__)
@@ -22,13 +20,20 @@ logger = logging.getLogger(__name__)
 _APP_NAME = "zhi"
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
     """Get platform-specific config directory.
 
     macOS: ~/Library/Application Support/zhi/
     Windows: %APPDATA%/zhi/
     Linux: ~/.config/zhi/
+
+    The result is computed once per process; code that changes
+    ``XDG_CONFIG_HOME`` (or the platform equivalent) afterwards must call
+    ``get_config_dir.cache_clear()``.
     """
+    import platformdirs
+
     return Path(platformdirs.user_config_dir(_APP_NAME))
 
 
@@ -65,6 +70,19 @@ class ZhiConfig:
         return bool(self.api_key)
 
 
+# Env var -> config key overrides applied by load_config
+_ENV_OVERRIDES = {
+    "ZHI_API_KEY": "api_key",
+    "ZHI_DEFAULT_MODEL": "default_model",
+    "ZHI_OUTPUT_DIR": "output_dir",
+    "ZHI_LOG_LEVEL": "log_level",
+    "ZHI_LANGUAGE": "language",
+}
+
+# Keys accepted from the config file; anything else is ignored
+_CONFIG_FIELDS = frozenset(ZhiConfig.__dataclass_fields__)
+
+
 def load_config(config_dir: Path | None = None) -> ZhiConfig:
     """Load config from YAML file with env var overrides.
 
@@ -77,8 +95,12 @@ def load_config(config_dir: Path | None = None) -> ZhiConfig:
     data: dict[str, object] = {}
 
     if config_file.exists():
+        import yaml
+
+        # Prefer the LibYAML loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         try:
-            raw = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+            raw = yaml.load(config_file.read_text(encoding="utf-8"), Loader=loader)
             if isinstance(raw, dict):
                 data = raw
             else:
@@ -87,21 +109,14 @@ def load_config(config_dir: Path | None = None) -> ZhiConfig:
             logger.warning("Failed to parse config file: %s", exc)
 
     # Apply env var overrides
-    env_mappings = {
-        "ZHI_API_KEY": "api_key",
-        "ZHI_DEFAULT_MODEL": "default_model",
-        "ZHI_OUTPUT_DIR": "output_dir",
-        "ZHI_LOG_LEVEL": "log_level",
-        "ZHI_LANGUAGE": "language",
-    }
-    for env_var, config_key in env_mappings.items():
-        value = os.environ.get(env_var)
+    environ = os.environ
+    for env_var, config_key in _ENV_OVERRIDES.items():
+        value = environ.get(env_var)
         if value:
             data[config_key] = value
 
     # Build config, ignoring unknown keys
-    known_fields = {f.name for f in ZhiConfig.__dataclass_fields__.values()}
-    filtered: dict[str, Any] = {k: v for k, v in data.items() if k in known_fields}
+    filtered: dict[str, Any] = {k: v for k, v in data.items() if k in _CONFIG_FIELDS}
 
     # Coerce max_turns to int to avoid TypeError in validate()
     if "max_turns" in filtered:
@@ -127,19 +142,32 @@ def save_config(config: ZhiConfig, config_dir: Path | None = None) -> Path:
     config_dir.mkdir(parents=True, exist_ok=True)
     config_file = config_dir / "config.yaml"
 
-    data = asdict(config)
-    config_file.write_text(yaml.dump(data, default_flow_style=False), encoding="utf-8")
-
-    # Set restrictive permissions (owner-only read/write)
-    try:
-        config_file.chmod(0o600)
-    except OSError as exc:
-        logger.warning(
-            "Could not set restrictive permissions on %s: %s. "
-            "API key may be readable by other users.",
-            config_file,
-            exc,
-        )
+    import yaml
+
+    # Flat, immutable values: a plain read beats asdict()'s recursive deepcopy
+    data = {name: getattr(config, name) for name in ZhiConfig.__dataclass_fields__}
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    # Serialize before opening: the open truncates, and a failed dump must
+    # not leave an empty config behind (losing the stored API key)
+    text = yaml.dump(data, Dumper=dumper, default_flow_style=False)
+
+    # Create the file owner-only (read/write) so the API key is never
+    # readable by others, not even between writing and a later chmod
+    fd = os.open(config_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        # The mode above only applies on creation; tighten an existing
+        # file before the key goes into it (no fchmod on older Windows)
+        if hasattr(os, "fchmod"):
+            try:
+                os.fchmod(fd, 0o600)
+            except OSError as exc:
+                logger.warning(
+                    "Could not set restrictive permissions on %s: %s. "
+                    "API key may be readable by other users.",
+                    config_file,
+                    exc,
+                )
+        f.write(text)
 
     return config_file
 
@@ -7,7 +7,9 @@ Stack traces go to ~/.zhi/logs/, never shown unless --debug.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
 
 @dataclass
@@ -131,7 +133,7 @@ def format_error(error: ZhiError) -> str:
 
 
 # Error catalog: templates for common errors, keyed by error code.
-ERROR_CATALOG: dict[str, ZhiError] = {
+_ERROR_CATALOG: dict[str, ZhiError] = {
     "AUTH_INVALID_KEY": ApiError(
         "Invalid API key",
         code="AUTH_INVALID_KEY",
@@ -265,3 +267,6 @@ ERROR_CATALOG: dict[str, ZhiError] = {
         ],
     ),
 }
+
+# Shared across callers, so expose it read-only
+ERROR_CATALOG: Mapping[str, ZhiError] = MappingProxyType(_ERROR_CATALOG)
@@ -6,7 +6,11 @@ and builds enriched messages for the LLM.
 
 from __future__ import annotations
 
+import codecs
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -14,9 +18,12 @@ from typing import Any
 # Matches absolute paths (/...) or tilde paths (~/ ...) that end with a file extension.
 # Handles backslash-escaped spaces (e.g., /path/to/file\ name.xlsx).
 # Requires a `/` separator to avoid matching bare /word patterns.
+# The lookbehind is ASCII-only so a path glued to CJK text still matches, while
+# \s stays Unicode so full-width and no-break spaces end a path.
 _FILE_PATH_RE = re.compile(
-    r"(?<!\w)"  # not preceded by a word char (avoids matching URLs like https://)
-    r"(~?/(?:[^\s\\]|\\.)*\.\w{1,5})"  # path with extension
+    r"(?<![A-Za-z0-9_])"  # not preceded by a word char (avoids URLs like https://)
+    # path with extension; unrolled so plain runs match without per-char alternation
+    r"(~?/[^\s\\]*(?:\\.[^\s\\]*)*\.\w{1,5})"
     r"(?=\s|$)"  # followed by whitespace or end
 )
 
@@ -24,11 +31,19 @@ _FILE_PATH_RE = re.compile(
 def find_file_paths(text: str) -> list[Path]:
     """Detect file paths in text that exist on disk.
 
-    Returns a list of resolved Path objects for files that actually exist.
+    Returns the paths as written (with ~ expanded) for regular files that
+    exist, so callers can find them in the text again; a file mentioned
+    twice, even via a symlink, is returned once.
     Skips paths that look like slash commands (no directory separator after initial /).
     """
+    # Every candidate is a slash followed later by an extension dot; most
+    # chat messages have neither, and str.find is far cheaper than the regex
+    slash = text.find("/")
+    if slash < 0 or text.find(".", slash) < 0:
+        return []
+
     paths: list[Path] = []
-    seen: set[Path] = set()
+    seen: set[tuple[int, int]] = set()
 
     for match in _FILE_PATH_RE.finditer(text):
         raw = match.group(1)
@@ -40,59 +55,69 @@ def find_file_paths(text: str) -> list[Path]:
         if cleaned.startswith("~"):
             cleaned = str(Path.home()) + cleaned[1:]
 
-        candidate = Path(cleaned)
-
+        # One stat rejects missing paths and non-regular files and gives the
+        # file identity for dedup, with no resolve() symlink walk
         try:
-            resolved = candidate.resolve()
-            is_file = resolved.is_file()
+            st = os.stat(cleaned)
         except (OSError, ValueError):
             continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
 
-        if is_file and resolved not in seen:
-            paths.append(resolved)
-            seen.add(resolved)
+        key = (st.st_dev, st.st_ino)
+        if key not in seen:
+            paths.append(Path(cleaned))
+            seen.add(key)
 
     return paths
 
 
 # Text-readable extensions that can be read directly (no API needed)
-_TEXT_EXTENSIONS = {
-    ".txt",
-    ".md",
-    ".csv",
-    ".json",
-    ".yaml",
-    ".yml",
-    ".xml",
-    ".html",
-    ".log",
-    ".py",
-    ".js",
-    ".ts",
-    ".toml",
-    ".ini",
-    ".cfg",
-    ".conf",
-    ".sh",
-    ".bat",
-}
+_TEXT_EXTENSIONS = frozenset(
+    {
+        ".txt",
+        ".md",
+        ".csv",
+        ".json",
+        ".yaml",
+        ".yml",
+        ".xml",
+        ".html",
+        ".log",
+        ".py",
+        ".js",
+        ".ts",
+        ".toml",
+        ".ini",
+        ".cfg",
+        ".conf",
+        ".sh",
+        ".bat",
+    }
+)
 
 # Extensions requiring Zhipu file-extract API
-_EXTRACT_EXTENSIONS = {
-    ".pdf",
-    ".png",
-    ".jpg",
-    ".jpeg",
-    ".gif",
-    ".webp",
-    ".xls",
-    ".xlsx",
-    ".docx",
-    ".doc",
-    ".pptx",
-}
+_EXTRACT_EXTENSIONS = frozenset(
+    {
+        ".pdf",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+        ".xls",
+        ".xlsx",
+        ".docx",
+        ".doc",
+        ".pptx",
+    }
+)
 
 _MAX_TEXT_SIZE = 50 * 1024  # 50KB per file
+# Bytes read from a text file: UTF-8 needs at most 4 per character, so this
+# always decodes past _MAX_TEXT_SIZE characters when the file is longer
+_MAX_TEXT_READ = 4 * _MAX_TEXT_SIZE + 4
+_MAX_EXTRACT_WORKERS = 8  # concurrent file reads / file-extract API calls
 
 
 @dataclass
@@ -118,34 +143,57 @@ def extract_files(
     if not paths:
         return text, []
 
-    attachments: list[FileAttachment] = []
+    attachments = _extract_many(paths, client)
     cleaned = text
 
     for i, path in enumerate(paths, 1):
         filename = path.name
-        att = _extract_one(path, client)
-        attachments.append(att)
 
         # Replace the path in text with a placeholder
         placeholder = f"[File {i}: {filename}]"
         # Replace escaped-space version first, then plain
-        escaped = str(path).replace(" ", "\\ ")
-        if escaped in cleaned:
-            cleaned = cleaned.replace(escaped, placeholder, 1)
-        elif str(path) in cleaned:
-            cleaned = cleaned.replace(str(path), placeholder, 1)
+        plain = str(path)
+        escaped = plain.replace(" ", "\\ ")
+        replaced = _replace_once(cleaned, escaped, placeholder)
+        if replaced is None and escaped != plain:
+            replaced = _replace_once(cleaned, plain, placeholder)
+        if replaced is not None:
+            cleaned = replaced
 
     return cleaned, attachments
 
 
+def _replace_once(text: str, old: str, new: str) -> str | None:
+    """Replace the first ``old`` in ``text`` with one scan; None if absent."""
+    head, found, tail = text.partition(old)
+    return head + new + tail if found else None
+
+
+def _extract_many(paths: list[Path], client: Any) -> list[FileAttachment]:
+    """Extract several files concurrently, returning results in input order.
+
+    File-extract API calls are network-bound, so threads overlap the waits;
+    batches of local text files are read in order, as pool startup would
+    outweigh their capped reads.  _extract_one never raises.
+    """
+    if len(paths) <= 1 or not any(
+        path.suffix.lower() in _EXTRACT_EXTENSIONS for path in paths
+    ):
+        return [_extract_one(path, client) for path in paths]
+    workers = min(len(paths), _MAX_EXTRACT_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zhi-file") as ex:
+        return list(ex.map(lambda path: _extract_one(path, client), paths))
+
+
 def _extract_one(path: Path, client: Any) -> FileAttachment:
     """Extract content from a single file."""
     filename = path.name
     ext = path.suffix.lower()
 
     try:
+        total_bytes: int | None = None
         if ext in _TEXT_EXTENSIONS:
-            content = _read_text_file(path)
+            content, total_bytes = _read_text_file(path)
         elif ext in _EXTRACT_EXTENSIONS:
             content = client.file_extract(path)
         else:
@@ -158,9 +206,13 @@ def _extract_one(path: Path, client: Any) -> FileAttachment:
 
         # Truncate large content
         if len(content) > _MAX_TEXT_SIZE:
+            # Always report the total in KB: a file cut off while reading
+            # only has its byte size, never its character count
+            if total_bytes is None:
+                total_bytes = len(content.encode("utf-8"))
             content = (
                 content[:_MAX_TEXT_SIZE]
-                + f"\n[truncated, showing first 50KB of {len(content)} chars]"
+                + f"\n[truncated, showing first 50KB of {total_bytes / 1024:.1f}KB]"
             )
 
         return FileAttachment(path=path, filename=filename, content=content)
@@ -174,9 +226,22 @@ def _extract_one(path: Path, client: Any) -> FileAttachment:
         )
 
 
-def _read_text_file(path: Path) -> str:
-    """Read a text file, handling encoding gracefully."""
+def _read_text_file(path: Path) -> tuple[str, int | None]:
+    """Read a text file, handling encoding gracefully.
+
+    Only the first _MAX_TEXT_READ bytes are read.  Returns the decoded text
+    and, when the file was longer than that, its full size in bytes.
+    """
+    with path.open("rb") as f:
+        raw = f.read(_MAX_TEXT_READ + 1)
+        total_bytes = None
+        if len(raw) > _MAX_TEXT_READ:
+            total_bytes = os.fstat(f.fileno()).st_size
+            raw = raw[:_MAX_TEXT_READ]
     try:
-        return path.read_text(encoding="utf-8")
+        # A cut-off read may end mid-character; drop that partial tail
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        content = decoder.decode(raw, final=total_bytes is None)
     except UnicodeDecodeError:
-        return path.read_text(encoding="latin-1")
+        content = raw.decode("latin-1")
+    return content, total_bytes
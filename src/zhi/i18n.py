@@ -79,12 +79,19 @@ CHAT_SYSTEM_PROMPT = (
 # ---------------------------------------------------------------------------
 
 _current_language: str = "auto"
+# resolve_language() result; env and locale are fixed for the process, so
+# only set_language() can change it
+_resolved_language: str | None = None
+# String table t() reads from, picked with the resolved language
+_active_strings: dict[str, str] | None = None
 
 
 def set_language(lang: str) -> None:
     """Set the UI language. Accepts 'auto', 'en', or 'zh'."""
-    global _current_language
+    global _current_language, _resolved_language, _active_strings
     _current_language = lang
+    _resolved_language = None
+    _active_strings = None
 
 
 def get_language() -> str:
@@ -104,6 +111,18 @@ def _get_system_locale() -> str | None:
 def resolve_language() -> str:
     """Resolve 'auto' to a concrete language code ('en' or 'zh').
 
+    The result is cached until the next set_language() call, since t()
+    resolves the language on every lookup.
+    """
+    global _resolved_language
+    if _resolved_language is None:
+        _resolved_language = _detect_language()
+    return _resolved_language
+
+
+def _detect_language() -> str:
+    """Detect the UI language from settings, environment and locale.
+
     Detection order:
     1. If language is explicitly set to 'en' or 'zh', use that.
     2. Check ZHI_LANGUAGE env var.
@@ -131,13 +150,15 @@ def resolve_language() -> str:
     return "en"
 
 
+# Constant prompt prefixes, so each skill prompt costs a single concatenation
+_PREAMBLE_PREFIX = LANGUAGE_PREAMBLE + "\n\n"
+_ASK_USER_PREFIX = _PREAMBLE_PREFIX + ASK_USER_PREAMBLE + "\n\n"
+
+
 def prepend_preamble(system_prompt: str, *, has_ask_user: bool = False) -> str:
     """Prepend the language preamble (and optionally ask_user preamble) to a skill system prompt."""
-    parts = [LANGUAGE_PREAMBLE]
-    if has_ask_user:
-        parts.append(ASK_USER_PREAMBLE)
-    parts.append(system_prompt)
-    return "\n\n".join(parts)
+    prefix = _ASK_USER_PREFIX if has_ask_user else _PREAMBLE_PREFIX
+    return prefix + system_prompt
 
 
 # ---------------------------------------------------------------------------
@@ -271,6 +292,8 @@ _STRINGS: dict[str, dict[str, str]] = {
         "cli.setup_help": "Re-run the setup wizard",
         "cli.debug_help": "Enable debug logging",
         "cli.nocolor_help": "Disable colored output",
+        "cli.notools_help": "Answer without tools (faster for plain questions)",
+        "cli.notools_mode": "--no-tools only applies to -c and piped input",
         "cli.language_help": "Interface language (auto, en, zh)",
         "cli.run_help": "Run a skill",
         "cli.skill_help": "Name of the skill to run",
@@ -419,6 +442,8 @@ _STRINGS: dict[str, dict[str, str]] = {
         "cli.setup_help": "\u91cd\u65b0\u8fd0\u884c\u8bbe\u7f6e\u5411\u5bfc",
         "cli.debug_help": "\u542f\u7528\u8c03\u8bd5\u65e5\u5fd7",
         "cli.nocolor_help": "\u7981\u7528\u5f69\u8272\u8f93\u51fa",
+        "cli.notools_help": "\u4e0d\u4f7f\u7528\u5de5\u5177\u76f4\u63a5\u56de\u7b54 (\u7eaf\u95ee\u7b54\u66f4\u5feb)",
+        "cli.notools_mode": "--no-tools \u4ec5\u9002\u7528\u4e8e -c \u548c\u7ba1\u9053\u8f93\u5165",
         "cli.language_help": "\u754c\u9762\u8bed\u8a00 (auto, en, zh)",
         "cli.run_help": "\u8fd0\u884c\u6280\u80fd",
         "cli.skill_help": "\u6280\u80fd\u540d\u79f0",
@@ -443,6 +468,13 @@ _STRINGS: dict[str, dict[str, str]] = {
     },
 }
 
+# Per-language lookup tables with English filled in under missing keys, so
+# t() resolves a key with a single probe
+_EFFECTIVE: dict[str, dict[str, str]] = {
+    lang: strings if lang == "en" else {**_STRINGS["en"], **strings}
+    for lang, strings in _STRINGS.items()
+}
+
 
 def t(key: str, **kwargs: Any) -> str:
     """Look up a translatable string by key.
@@ -450,12 +482,16 @@ def t(key: str, **kwargs: Any) -> str:
     Falls back to English if the key is missing in the current language,
     and falls back to the raw key if missing entirely.
     """
-    lang = resolve_language()
-    strings = _STRINGS.get(lang, _STRINGS["en"])
-    template = strings.get(key, _STRINGS["en"].get(key, key))
+    global _active_strings
+    strings = _active_strings
+    if strings is None:
+        strings = _EFFECTIVE.get(resolve_language(), _STRINGS["en"])
+        _active_strings = strings
+    template = strings.get(key, key)
     if not kwargs:
         return template
     try:
-        return template.format(**kwargs)
+        # kwargs is already a fresh dict; format_map skips re-packing it
+        return template.format_map(kwargs)
     except KeyError:
         return template
@@ -44,6 +44,9 @@ MODELS: dict[str, ModelInfo] = {
     ),
 }
 
+# Registry order, for completion and "available models" messages
+MODEL_NAMES: tuple[str, ...] = tuple(MODELS)
+
 
 def get_model(name: str) -> ModelInfo | None:
     """Get model info by name. Returns None if unknown."""
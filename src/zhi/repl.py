@@ -22,16 +22,17 @@ from prompt_toolkit.formatted_text import HTML
 from prompt_toolkit.history import FileHistory, InMemoryHistory
 
 from zhi.agent import (
+    ROLE_SYSTEM,
+    ROLE_USER,
     AgentInterruptedError,
     Context,
     PermissionMode,
-    Role,
     safe_parse_args,
 )
 from zhi.agent import run as agent_run
 from zhi.files import FileAttachment, extract_files
 from zhi.i18n import prepend_preamble, t
-from zhi.models import MODELS, is_valid_model
+from zhi.models import MODEL_NAMES, is_valid_model
 from zhi.ui import UI
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,7 @@ _SLASH_COMMANDS = frozenset(
 )
 
 _MAX_HISTORY_ENTRIES = 10_000
+_AVAILABLE_MODELS = ", ".join(MODEL_NAMES)
 _SKILLS_CACHE_TTL = 5.0  # seconds
 
 
@@ -163,7 +165,7 @@ class ReplSession:
 
         self._completer = _ZhiCompleter(
             commands=list(_SLASH_COMMANDS),
-            models=list(MODELS.keys()),
+            models=list(MODEL_NAMES),
             skills_fn=lambda: list(self._skills_cache.get().keys()),
         )
 
@@ -311,9 +313,10 @@ class ReplSession:
         """Switch the model for the current session."""
         model_name = args.strip()
         if not model_name:
-            available = ", ".join(MODELS.keys())
             msg = t(
-                "repl.current_model", model=self._context.model, available=available
+                "repl.current_model",
+                model=self._context.model,
+                available=_AVAILABLE_MODELS,
             )
             self._ui.print(msg)
             return msg
@@ -322,7 +325,7 @@ class ReplSession:
             msg = t(
                 "repl.unknown_model",
                 model=model_name,
-                available=", ".join(MODELS.keys()),
+                available=_AVAILABLE_MODELS,
             )
             self._ui.print(msg)
             return msg
@@ -526,13 +529,13 @@ class ReplSession:
         if effective_prompt:
             conversation.append(
                 {
-                    "role": Role.SYSTEM.value,
+                    "role": ROLE_SYSTEM,
                     "content": prepend_preamble(
                         effective_prompt, has_ask_user=has_ask_user
                     ),
                 }
             )
-        conversation.append({"role": Role.USER.value, "content": user_content})
+        conversation.append({"role": ROLE_USER, "content": user_content})
 
         def _ask_user_repl(question: str, options: list[str] | None) -> str:
             """Prompt the user for input during skill execution."""
@@ -714,9 +717,7 @@ class ReplSession:
             return ""
         # Keep system messages
         self._context.conversation = [
-            msg
-            for msg in self._context.conversation
-            if msg.get("role") == Role.SYSTEM.value
+            msg for msg in self._context.conversation if msg.get("role") == ROLE_SYSTEM
         ]
         msg = t("repl.cleared")
         self._ui.print(msg)
@@ -728,7 +729,7 @@ class ReplSession:
         conv = self._context.conversation
         last_user_idx = None
         for i in range(len(conv) - 1, -1, -1):
-            if conv[i].get("role") == Role.USER.value:
+            if conv[i].get("role") == ROLE_USER:
                 last_user_idx = i
                 break
 
@@ -826,7 +827,7 @@ class ReplSession:
             content = text + "\n\n" + "\n\n".join(file_sections)
 
         user_msg = {
-            "role": Role.USER.value,
+            "role": ROLE_USER,
             "content": content,
         }
         self._context.conversation.append(user_msg)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import warnings
 from pathlib import Path
 
@@ -37,15 +39,16 @@ def discover_skills(
     Returns:
         Dict mapping skill name to SkillConfig.
     """
-    if builtin_dir is None:
-        builtin_dir = BUILTIN_SKILLS_DIR
     if user_dir is None:
         user_dir = _default_user_skills_dir()
 
     skills: dict[str, SkillConfig] = {}
 
     # Load builtin skills
-    skills.update(_scan_directory(builtin_dir, source="builtin"))
+    if builtin_dir is None:
+        skills.update(_builtin_skills())
+    else:
+        skills.update(_scan_directory(builtin_dir, source="builtin"))
 
     # Load user skills (override builtins)
     skills.update(_scan_directory(user_dir, source="user"))
@@ -53,6 +56,17 @@ def discover_skills(
     return skills
 
 
+@functools.lru_cache(maxsize=1)
+def _builtin_skills() -> dict[str, SkillConfig]:
+    """Scan the packaged builtin skills once per process.
+
+    They ship with zhi and do not change at runtime, unlike user skills,
+    which are rescanned on every call so new ones show up immediately.
+    Callers must copy the result rather than mutate it.
+    """
+    return _scan_directory(BUILTIN_SKILLS_DIR, source="builtin")
+
+
 def _scan_directory(directory: Path, source: str) -> dict[str, SkillConfig]:
     """Scan a directory for skill YAML files and SKILL.md directories.
 
@@ -63,13 +77,19 @@ def _scan_directory(directory: Path, source: str) -> dict[str, SkillConfig]:
     if not directory.is_dir():
         return skills
 
-    # 1. Scan for YAML files (existing behaviour)
+    # One listing serves both passes; DirEntry caches the file type, so
+    # telling skill directories apart needs no extra stat per entry.
     try:
-        yaml_paths = sorted(directory.glob("*.yaml"))
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: os.path.normcase(e.name))
     except OSError as exc:
         logger.warning("Cannot scan skill directory %s: %s", directory, exc)
         return skills
 
+    # 1. Scan for YAML files (existing behaviour)
+    yaml_paths = [
+        Path(e.path) for e in entries if os.path.normcase(e.name).endswith(".yaml")
+    ]
     for yaml_path in yaml_paths:
         try:
             config = load_skill(yaml_path, source=source)
@@ -83,9 +103,10 @@ def _scan_directory(directory: Path, source: str) -> dict[str, SkillConfig]:
 
     # 2. Scan for SKILL.md directories (new behaviour)
     try:
-        for subdir in sorted(directory.iterdir()):
-            if not subdir.is_dir():
+        for entry in entries:
+            if not entry.is_dir():
                 continue
+            subdir = Path(entry.path)
             skill_md_path = subdir / "SKILL.md"
             if skill_md_path.is_file():
                 try:
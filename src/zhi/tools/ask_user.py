@@ -15,6 +15,8 @@ class AskUserTool(BaseTool):
     and returns their answer as the tool result.
     """
 
+    __slots__ = ("_callback",)
+
     name: ClassVar[str] = "ask_user"
     description: ClassVar[str] = (
         "Ask the user a question and wait for their response. "
@@ -32,14 +32,20 @@ class BaseTool(ABC):
       - description: human-readable description for the model
       - parameters: JSON Schema dict describing accepted parameters
       - risky: whether the tool requires user permission (default False)
+      - parallel_safe: whether the tool may run concurrently with other
+        parallel-safe calls from the same turn (default False)
 
     And implement the execute() method.
     """
 
+    # Subclasses declare their own instance attributes in __slots__
+    __slots__ = ()
+
     name: ClassVar[str]
     description: ClassVar[str]
     parameters: ClassVar[dict[str, Any]]
     risky: ClassVar[bool] = False
+    parallel_safe: ClassVar[bool] = False
 
     @abstractmethod
     def execute(self, **kwargs: Any) -> str:
@@ -39,6 +39,8 @@ def _human_readable_size(size_bytes: int) -> str:
 class FileListTool(BaseTool):
     """List directory contents with metadata."""
 
+    __slots__ = ("_working_dir",)
+
     name: ClassVar[str] = "file_list"
     description: ClassVar[str] = (
         "List files and directories with name, size, and modification date. "
@@ -60,6 +62,7 @@ class FileListTool(BaseTool):
         },
     }
     risky: ClassVar[bool] = False
+    parallel_safe: ClassVar[bool] = True
 
     def __init__(self, working_dir: Path | None = None) -> None:
         self._working_dir = working_dir or Path.cwd()
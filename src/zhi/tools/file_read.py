@@ -13,6 +13,8 @@ _MAX_FILE_SIZE = 100 * 1024  # 100KB
 class FileReadTool(BaseTool):
     """Read the contents of a text file."""
 
+    __slots__ = ("_working_dir",)
+
     name: ClassVar[str] = "file_read"
     description: ClassVar[str] = (
         "Read the contents of a text file. "
@@ -30,6 +32,7 @@ class FileReadTool(BaseTool):
         "required": ["path"],
     }
     risky: ClassVar[bool] = False
+    parallel_safe: ClassVar[bool] = True
 
     def __init__(self, working_dir: Path | None = None) -> None:
         self._working_dir = working_dir or Path.cwd()
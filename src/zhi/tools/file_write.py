@@ -27,6 +27,8 @@ class FileWriteTool(BaseTool):
     - .docx: {"content": "markdown string"}
     """
 
+    __slots__ = ("_output_dir",)
+
     name: ClassVar[str] = "file_write"
     description: ClassVar[str] = (
         "Write a new file to the output directory (zhi-output/). "
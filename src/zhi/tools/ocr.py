@@ -20,6 +20,8 @@ class OcrClient(Protocol):
 class OcrTool(BaseTool):
     """Extract text from images and PDFs via OCR."""
 
+    __slots__ = ("_client", "_working_dir")
+
     name: ClassVar[str] = "ocr"
     description: ClassVar[str] = (
         "Extract text from images and PDFs using OCR. "
@@ -37,6 +39,7 @@ class OcrTool(BaseTool):
         "required": ["path"],
     }
     risky: ClassVar[bool] = False
+    parallel_safe: ClassVar[bool] = True
 
     def __init__(self, client: OcrClient, working_dir: Path | None = None) -> None:
         self._client = client
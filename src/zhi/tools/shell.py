@@ -69,6 +69,8 @@ _DESTRUCTIVE_PATTERNS = [
 class ShellTool(BaseTool):
     """Execute shell commands with safety checks."""
 
+    __slots__ = ("_permission_callback",)
+
     name: ClassVar[str] = "shell"
     description: ClassVar[str] = (
         "Execute a shell command. Every command requires explicit user confirmation. "
@@ -24,6 +24,8 @@ _MAX_REFERENCES_SIZE = 50_000
 class SkillCreateTool(BaseTool):
     """Create a new skill as a SKILL.md directory or YAML file."""
 
+    __slots__ = ("_default_model", "_known_tool_names", "_skills_dir")
+
     name: ClassVar[str] = "skill_create"
     description: ClassVar[str] = (
         "Create a new skill. Default format is SKILL.md (a directory with "
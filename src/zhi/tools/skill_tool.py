@@ -7,7 +7,7 @@ from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from zhi.agent import Context, PermissionMode, Role, ToolLike
+from zhi.agent import ROLE_SYSTEM, ROLE_USER, Context, PermissionMode, ToolLike
 from zhi.agent import run as agent_run
 from zhi.i18n import prepend_preamble
 from zhi.models import get_model
@@ -368,14 +368,14 @@ class SkillTool:
         if effective_prompt:
             conversation.append(
                 {
-                    "role": Role.SYSTEM.value,
+                    "role": ROLE_SYSTEM,
                     "content": prepend_preamble(
                         effective_prompt,
                         has_ask_user=has_ask_user,
                     ),
                 }
             )
-        conversation.append({"role": Role.USER.value, "content": user_input})
+        conversation.append({"role": ROLE_USER, "content": user_input})
 
         # Enable thinking for models that support it
         model_info = get_model(self._skill.model)
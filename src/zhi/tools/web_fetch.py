@@ -87,6 +87,8 @@ _MAX_REDIRECTS = 5
 class WebFetchTool(BaseTool):
     """Fetch content from a URL."""
 
+    __slots__ = ()
+
     name: ClassVar[str] = "web_fetch"
     description: ClassVar[str] = (
         "Fetch the text content of a web page. "
@@ -104,6 +106,7 @@ class WebFetchTool(BaseTool):
         "required": ["url"],
     }
     risky: ClassVar[bool] = False
+    parallel_safe: ClassVar[bool] = True
 
     def _validate_url(self, url: str) -> str | None:
         """Validate a URL for SSRF. Returns error string or None if OK."""
@@ -10,12 +10,11 @@ import json
 import logging
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Any
 
-import httpx
-
 from zhi.config import get_config_dir
 from zhi.i18n import t
 
@@ -74,8 +73,13 @@ def _cache_path(config_dir: Path | None = None) -> Path:
     return config_dir / _CACHE_FILE
 
 
-def _read_cache(config_dir: Path | None = None) -> dict[str, Any] | None:
-    """Read the update cache. Returns None if missing/expired/corrupt."""
+def _read_cache(
+    config_dir: Path | None = None, *, allow_stale: bool = False
+) -> dict[str, Any] | None:
+    """Read the update cache. Returns None if missing/expired/corrupt.
+
+    With ``allow_stale=True`` an expired entry is still returned.
+    """
     path = _cache_path(config_dir)
     if not path.exists():
         return None
@@ -84,7 +88,7 @@ def _read_cache(config_dir: Path | None = None) -> dict[str, Any] | None:
         if not isinstance(data, dict):
             return None
         checked_at = data.get("checked_at", 0)
-        if time.time() - checked_at > _CACHE_TTL:
+        if not allow_stale and time.time() - checked_at > _CACHE_TTL:
             return None
         if "version" not in data:
             return None
@@ -111,6 +115,8 @@ def _write_cache(version: str, config_dir: Path | None = None) -> None:
 
 def _fetch_latest_version_pypi() -> str | None:
     """Fetch the latest version string from PyPI. Returns None on failure."""
+    import httpx
+
     try:
         resp = httpx.get(_PYPI_URL, timeout=_REQUEST_TIMEOUT, follow_redirects=True)
         resp.raise_for_status()
@@ -126,11 +132,22 @@ def _fetch_latest_version_pypi() -> str | None:
 # ---------------------------------------------------------------------------
 
 
+def _refresh_cache(config_dir: Path | None = None) -> None:
+    """Fetch the latest version and cache it. Never raises."""
+    try:
+        latest = _fetch_latest_version_pypi()
+        if latest is not None:
+            _write_cache(latest, config_dir)
+    except Exception:
+        logger.debug("Background update check failed", exc_info=True)
+
+
 def check_for_update(
     current_version: str,
     config_dir: Path | None = None,
     *,
     force: bool = False,
+    background: bool = False,
 ) -> dict[str, str] | None:
     """Check if a newer version is available.
 
@@ -139,6 +156,9 @@ def check_for_update(
 
     Uses a 24-hour cache to avoid hitting the network every invocation.
     Pass ``force=True`` to bypass the cache (used by ``zhi update``).
+    With ``background=True`` a missing or expired cache never blocks:
+    the answer comes from the stale entry (if any) while a daemon thread
+    refreshes the cache for the next run (used at REPL startup).
 
     This function never raises — all errors are caught and logged.
     """
@@ -146,6 +166,16 @@ def check_for_update(
         # Try cache first
         if not force:
             cached = _read_cache(config_dir)
+            if cached is None and background:
+                threading.Thread(
+                    target=_refresh_cache,
+                    args=(config_dir,),
+                    name="zhi-update-check",
+                    daemon=True,
+                ).start()
+                cached = _read_cache(config_dir, allow_stale=True)
+                if cached is None:
+                    return None
             if cached is not None:
                 latest = cached["version"]
                 if is_newer(latest, current_version):
@@ -206,6 +236,8 @@ def update_pip() -> bool:
 
 def _get_exe_download_url() -> str | None:
     """Get the Windows exe download URL from the latest GitHub release."""
+    import httpx
+
     try:
         resp = httpx.get(
             _GITHUB_RELEASE_URL,
@@ -237,6 +269,8 @@ def update_exe(
 
     ``progress_callback``, if provided, is called with (percent: int).
     """
+    import httpx
+
     current_exe = Path(sys.executable)
     if not current_exe.exists():
         return False
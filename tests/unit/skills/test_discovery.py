@@ -111,24 +111,35 @@ class TestDiscoverSkills:
         assert skills["pdf"].model == "glm-4-flash"
         assert skills["docx"].source == "builtin"
 
-    def test_scan_directory_oserror_on_glob(self, tmp_path: Path) -> None:
-        """Bug 10: OSError on glob() should return empty dict, not crash."""
+    def test_scan_directory_oserror_on_listing(self, tmp_path: Path) -> None:
+        """Bug 10: OSError listing the directory should return empty dict."""
         skills_dir = tmp_path / "skills"
         skills_dir.mkdir()
         _write_skill(skills_dir, "good-skill")
 
-        orig_glob = Path.glob
-
-        def patched_glob(self_path: Path, pattern: str) -> list[Path]:
-            if self_path == skills_dir:
-                raise PermissionError("Permission denied")
-            return list(orig_glob(self_path, pattern))
-
-        with patch.object(Path, "glob", patched_glob):
+        with patch(
+            "zhi.skills.os.scandir", side_effect=PermissionError("Permission denied")
+        ):
             result = _scan_directory(skills_dir, source="user")
 
         assert result == {}  # Graceful empty, no crash
 
+    def test_default_builtin_dir_scanned_once(self, tmp_path: Path) -> None:
+        from zhi.skills import _builtin_skills
+
+        _builtin_skills.cache_clear()
+        user = tmp_path / "user"
+        with patch("zhi.skills._scan_directory", wraps=_scan_directory) as scan:
+            first = discover_skills(user_dir=user)
+            second = discover_skills(user_dir=user)
+        _builtin_skills.cache_clear()
+
+        sources = [c.kwargs["source"] for c in scan.call_args_list]
+        assert sources.count("builtin") == 1
+        assert sources.count("user") == 2
+        assert first == second
+        assert first is not second
+
 
 def _write_skill_md(
     directory: Path, name: str, description: str = "Test", tools: str = "file_read"
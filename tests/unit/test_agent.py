@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass, field
 from typing import Any
 from unittest.mock import MagicMock
@@ -16,6 +17,7 @@ from zhi.agent import (
     _can_stream,
     _do_turn_streaming,
     _prune_for_api,
+    _response_cache,
     run,
 )
 from zhi.config import ZhiConfig
@@ -232,6 +234,194 @@ class TestAgentToolCalls:
         assert ctx.client.chat.call_count == 3
 
 
+class TestAgentParallelToolCalls:
+    """Test concurrent execution of parallel-safe tool calls."""
+
+    def test_parallel_safe_tools_run_concurrently(self) -> None:
+        """Parallel-safe tools overlap; results keep the original order."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierTool(MockTool):
+            parallel_safe = True
+
+            def execute(self, **kwargs: Any) -> str:
+                # Both calls must be in flight at once to pass the barrier
+                barrier.wait()
+                return super().execute(**kwargs)
+
+        tool_a = BarrierTool(name="tool_a", result="result_a")
+        tool_b = BarrierTool(name="tool_b", result="result_b")
+        responses = [
+            MockResponse(
+                tool_calls=[
+                    _make_tool_call("tool_a", call_id="call_1"),
+                    _make_tool_call("tool_b", call_id="call_2"),
+                ],
+            ),
+            MockResponse(content="done"),
+        ]
+        ctx = _make_context(responses, tools={"tool_a": tool_a, "tool_b": tool_b})
+
+        run(ctx)
+
+        tool_msgs = [m for m in ctx.conversation if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_msgs] == ["call_1", "call_2"]
+        assert [m["content"] for m in tool_msgs] == ["result_a", "result_b"]
+        assert ctx.tool_use_count == 2
+
+    def test_unsafe_tools_run_sequentially(self) -> None:
+        """Tools without parallel_safe never overlap."""
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        class TrackingTool(MockTool):
+            def execute(self, **kwargs: Any) -> str:
+                nonlocal active, max_active
+                with lock:
+                    active += 1
+                    max_active = max(max_active, active)
+                result = super().execute(**kwargs)
+                with lock:
+                    active -= 1
+                return result
+
+        tool = TrackingTool(name="tool_a")
+        responses = [
+            MockResponse(
+                tool_calls=[
+                    _make_tool_call("tool_a", call_id="call_1"),
+                    _make_tool_call("tool_a", call_id="call_2"),
+                ],
+            ),
+            MockResponse(content="done"),
+        ]
+        ctx = _make_context(responses, tools={"tool_a": tool})
+
+        run(ctx)
+
+        assert tool.call_count == 2
+        assert max_active == 1
+
+    def test_sequential_tool_is_a_barrier(self) -> None:
+        """A write finishes before the parallel reads that follow it start."""
+        events: list[str] = []
+        lock = threading.Lock()
+
+        class RecordingTool(MockTool):
+            def execute(self, **kwargs: Any) -> str:
+                with lock:
+                    events.append(f"start:{self.name}")
+                result = super().execute(**kwargs)
+                with lock:
+                    events.append(f"end:{self.name}")
+                return result
+
+        class ReadTool(RecordingTool):
+            parallel_safe = True
+
+        write = RecordingTool(name="file_write")
+        read = ReadTool(name="file_read")
+        started: list[str] = []
+        responses = [
+            MockResponse(
+                tool_calls=[
+                    _make_tool_call("file_write", call_id="call_1"),
+                    _make_tool_call("file_read", call_id="call_2"),
+                    _make_tool_call("file_read", call_id="call_3"),
+                ],
+            ),
+            MockResponse(content="done"),
+        ]
+        ctx = _make_context(responses, tools={"file_write": write, "file_read": read})
+        ctx.on_tool_start = lambda name, args: started.append(name)
+
+        run(ctx)
+
+        assert events[:2] == ["start:file_write", "end:file_write"]
+        assert read.call_count == 2
+        assert started == ["file_write", "file_read", "file_read"]
+        tool_msgs = [m for m in ctx.conversation if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_msgs] == ["call_1", "call_2", "call_3"]
+
+    def test_parallel_group_renders_one_line_per_tool(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Compact UI output keeps each tool's start and end on one line."""
+        from zhi.i18n import t
+        from zhi.ui import UI
+
+        class ReadTool(MockTool):
+            parallel_safe = True
+
+        ui = UI(no_color=True)
+        read = ReadTool(name="file_read")
+        responses = [
+            MockResponse(
+                tool_calls=[
+                    _make_tool_call("file_read", call_id=f"call_{n}") for n in range(3)
+                ],
+            ),
+            MockResponse(content="done"),
+        ]
+        ctx = _make_context(
+            responses,
+            tools={"file_read": read},
+            on_tool_start=ui.show_tool_start,
+            on_tool_end=ui.show_tool_end,
+            on_tool_total=ui.set_tool_total,
+        )
+
+        run(ctx)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 3
+        for step, line in enumerate(lines, start=1):
+            assert line.startswith(f"  [{step}/3] file_read ... {t('ui.trace_ok')} ")
+
+    def test_permission_asked_just_before_risky_tool(self) -> None:
+        """Prompts follow call order instead of running ahead of earlier tools."""
+        events: list[str] = []
+
+        class RecordingTool(MockTool):
+            parallel_safe = True
+
+            def execute(self, **kwargs: Any) -> str:
+                events.append(f"run:{self.name}")
+                return super().execute(**kwargs)
+
+        def on_permission(tool: Any, call: dict[str, Any]) -> bool:
+            events.append(f"ask:{tool.name}")
+            return True
+
+        read = RecordingTool(name="file_read")
+        write = RecordingTool(name="file_write", risky=True)
+        responses = [
+            MockResponse(
+                tool_calls=[
+                    _make_tool_call("file_read", call_id="call_1"),
+                    _make_tool_call("file_write", call_id="call_2"),
+                    _make_tool_call("file_read", call_id="call_3"),
+                ],
+            ),
+            MockResponse(content="done"),
+        ]
+        ctx = _make_context(
+            responses,
+            tools={"file_read": read, "file_write": write},
+            on_permission=on_permission,
+        )
+
+        run(ctx)
+
+        assert events == [
+            "run:file_read",
+            "ask:file_write",
+            "run:file_write",
+            "run:file_read",
+        ]
+
+
 class TestAgentMaxTurns:
     """Test max_turns limit."""
 
@@ -548,6 +738,29 @@ class TestAgentOutputTruncation:
         ]
         assert tool_msgs[0]["content"] == small_result
 
+    def test_agent_output_truncation_counts_bytes(self) -> None:
+        """Non-ASCII output is capped by UTF-8 size, not character count."""
+        large_result = "中" * 20_000  # 60,000 bytes in UTF-8
+        tool = MockTool(name="file_read", result=large_result)
+        responses = [
+            MockResponse(
+                tool_calls=[_make_tool_call("file_read")],
+            ),
+            MockResponse(content="Done"),
+        ]
+        ctx = _make_context(responses, tools={"file_read": tool})
+
+        run(ctx)
+
+        tool_msgs = [
+            m
+            for m in ctx.conversation
+            if m.get("role") == "tool" and m.get("tool_call_id") == "call_1"
+        ]
+        head, _, note = tool_msgs[0]["content"].partition("\n[truncated")
+        assert head == "中" * (50_000 // 3)
+        assert "of 60000 bytes]" in note
+
 
 class TestAgentArgParsing:
     """Test tool argument parsing edge cases."""
@@ -731,9 +944,7 @@ class TestAgentToolUseCount:
             ),
             MockResponse(content="Done"),
         ]
-        ctx = _make_context(
-            responses, tools={"tool_a": tool_a, "tool_b": tool_b}
-        )
+        ctx = _make_context(responses, tools={"tool_a": tool_a, "tool_b": tool_b})
 
         run(ctx)
 
@@ -756,9 +967,7 @@ class TestAgentToolUseCount:
 
     def test_tool_use_count_not_incremented_on_exception(self) -> None:
         """tool_use_count does NOT increment when tool raises an exception."""
-        tool = MockTool(
-            name="file_read", raises=RuntimeError("boom")
-        )
+        tool = MockTool(name="file_read", raises=RuntimeError("boom"))
         responses = [
             MockResponse(
                 tool_calls=[_make_tool_call("file_read")],
@@ -915,8 +1124,92 @@ class TestAgentStreaming:
         assert tc["function"]["name"] == "file_read"
         assert tc["function"]["arguments"] == '{"path":"a.txt"}'
 
-    def test_streaming_on_stream_called_per_chunk(self) -> None:
-        """on_stream is called for each content delta."""
+    def test_streaming_tool_calls_ordered_by_index(self) -> None:
+        """Tool calls arriving out of index order come back sorted."""
+
+        @dataclass
+        class MockChunk:
+            delta_content: str = ""
+            delta_thinking: str = ""
+            tool_calls: list[dict[str, Any]] = field(default_factory=list)
+            usage: dict[str, int] | None = None
+
+        chunks = [
+            MockChunk(
+                tool_calls=[
+                    {"index": 1, "id": "call_b", "function": {"name": "b"}},
+                ]
+            ),
+            MockChunk(
+                tool_calls=[
+                    {"index": 0, "id": "call_a", "function": {"name": "a"}},
+                ]
+            ),
+        ]
+
+        client = MagicMock()
+        client.chat_stream.return_value = iter(chunks)
+
+        ctx = Context(
+            config=ZhiConfig(),
+            client=client,
+            model="glm-5",
+            tools={},
+            tool_schemas=[],
+            permission_mode=PermissionMode.APPROVE,
+            streaming=True,
+            conversation=[{"role": "user", "content": "go"}],
+        )
+
+        result = _do_turn_streaming(ctx)
+
+        assert [tc["id"] for tc in result.tool_calls] == ["call_a", "call_b"]
+        assert [tc["function"]["name"] for tc in result.tool_calls] == ["a", "b"]
+
+    def test_streaming_cancel_closes_stream(self) -> None:
+        """Cancelling mid-stream closes the chunk generator."""
+
+        @dataclass
+        class MockChunk:
+            delta_content: str = ""
+            delta_thinking: str = ""
+            tool_calls: list[dict[str, Any]] = field(default_factory=list)
+            usage: dict[str, int] | None = None
+
+        closed = []
+
+        def stream(**kwargs: Any) -> Any:
+            try:
+                yield MockChunk(delta_content="Hello")
+                yield MockChunk(delta_content=" world")
+            finally:
+                closed.append(True)
+
+        client = MagicMock()
+        client.chat_stream.side_effect = stream
+
+        ctx = Context(
+            config=ZhiConfig(),
+            client=client,
+            model="glm-5",
+            tools={},
+            tool_schemas=[],
+            permission_mode=PermissionMode.APPROVE,
+            streaming=True,
+            conversation=[{"role": "user", "content": "hi"}],
+        )
+        ctx.on_stream = lambda text: ctx.cancel_event.set()
+
+        with pytest.raises(AgentInterruptedError):
+            _do_turn_streaming(ctx)
+
+        assert closed == [True]
+
+    def test_streaming_on_stream_called_per_chunk(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """on_stream is called for each content delta when not coalescing."""
+        monkeypatch.setattr("zhi.agent._STREAM_FLUSH_INTERVAL", 0.0)
 
         @dataclass
         class MockChunk:
@@ -956,6 +1249,96 @@ class TestAgentStreaming:
         on_stream.assert_any_call("b")
         on_stream.assert_any_call("c")
 
+    def test_streaming_on_stream_coalesces_fast_deltas(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Deltas inside the flush interval are merged after the first one."""
+        monkeypatch.setattr("zhi.agent._STREAM_FLUSH_INTERVAL", 60.0)
+
+        @dataclass
+        class MockChunk:
+            delta_content: str = ""
+            delta_thinking: str = ""
+            tool_calls: list[dict[str, Any]] = field(default_factory=list)
+            usage: dict[str, int] | None = None
+
+        chunks = [
+            MockChunk(delta_content="a"),
+            MockChunk(delta_content="b"),
+            MockChunk(delta_content="c"),
+        ]
+
+        on_stream = MagicMock()
+        client = MagicMock()
+        client.chat_stream.return_value = iter(chunks)
+
+        ctx = Context(
+            config=ZhiConfig(),
+            client=client,
+            model="glm-5",
+            tools={},
+            tool_schemas=[],
+            permission_mode=PermissionMode.APPROVE,
+            streaming=True,
+            on_stream=on_stream,
+            conversation=[{"role": "user", "content": "hi"}],
+        )
+
+        result = _do_turn_streaming(ctx)
+
+        assert [c.args[0] for c in on_stream.call_args_list] == ["a", "bc"]
+        assert result.content == "abc"
+
+    def test_streaming_flushes_pending_before_tool_call_delta(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Held-back content is shown as soon as a content-less chunk arrives."""
+        monkeypatch.setattr("zhi.agent._STREAM_FLUSH_INTERVAL", 60.0)
+
+        @dataclass
+        class MockChunk:
+            delta_content: str = ""
+            delta_thinking: str = ""
+            tool_calls: list[dict[str, Any]] = field(default_factory=list)
+            usage: dict[str, int] | None = None
+
+        chunks = [
+            MockChunk(delta_content="a"),
+            MockChunk(delta_content="b"),
+            MockChunk(
+                tool_calls=[
+                    {
+                        "index": 0,
+                        "id": "call_1",
+                        "function": {"name": "file_read", "arguments": "{}"},
+                    }
+                ]
+            ),
+            MockChunk(delta_content="c"),
+        ]
+
+        on_stream = MagicMock()
+        client = MagicMock()
+        client.chat_stream.return_value = iter(chunks)
+
+        ctx = Context(
+            config=ZhiConfig(),
+            client=client,
+            model="glm-5",
+            tools={},
+            tool_schemas=[],
+            permission_mode=PermissionMode.APPROVE,
+            streaming=True,
+            on_stream=on_stream,
+            conversation=[{"role": "user", "content": "hi"}],
+        )
+
+        result = _do_turn_streaming(ctx)
+
+        assert [c.args[0] for c in on_stream.call_args_list] == ["a", "b", "c"]
+        assert result.content == "abc"
+        assert result.tool_calls[0]["function"]["name"] == "file_read"
+
     def test_full_streaming_run_with_tools(self) -> None:
         """Full agent run using streaming with tool calls and final response."""
 
@@ -1199,3 +1582,86 @@ class TestPruneForApi:
         assert result[0]["role"] == "user"
         assert result[-1]["content"] == "end"
         assert len(result) <= 4
+
+
+class TestResponseCache:
+    """Test the opt-in response cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self) -> Any:
+        _response_cache.clear()
+        yield
+        _response_cache.clear()
+
+    def test_disabled_by_default(self) -> None:
+        """Without cache_enabled every turn calls the client."""
+        for _ in range(2):
+            ctx = _make_context([MockResponse(content="hi")])
+            ctx.conversation = [{"role": "user", "content": "hello"}]
+            run(ctx)
+            assert ctx.client.chat.call_count == 1
+        assert not _response_cache
+
+    def test_identical_request_served_from_cache(self) -> None:
+        """A repeated request skips the client and replays callbacks."""
+        first = _make_context([MockResponse(content="hi", thinking="hmm")])
+        first.cache_enabled = True
+        first.conversation = [{"role": "user", "content": "hello"}]
+        assert run(first) == "hi"
+
+        on_stream = MagicMock()
+        on_thinking = MagicMock()
+        second = _make_context([], on_stream=on_stream, on_thinking=on_thinking)
+        second.cache_enabled = True
+        second.conversation = [{"role": "user", "content": "hello"}]
+
+        assert run(second) == "hi"
+        second.client.chat.assert_not_called()
+        on_stream.assert_called_once_with("hi")
+        on_thinking.assert_called_once_with("hmm")
+        assert second.session_tokens == 0
+
+    def test_different_request_misses(self) -> None:
+        """A changed conversation is not served from the cache."""
+        first = _make_context([MockResponse(content="hi")])
+        first.cache_enabled = True
+        first.conversation = [{"role": "user", "content": "hello"}]
+        run(first)
+
+        second = _make_context([MockResponse(content="bye")])
+        second.cache_enabled = True
+        second.conversation = [{"role": "user", "content": "goodbye"}]
+
+        assert run(second) == "bye"
+        assert second.client.chat.call_count == 1
+
+    def test_expired_entry_misses(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Entries older than the TTL are discarded."""
+        monkeypatch.setenv("ZHI_RESPONSE_CACHE_TTL", "-1")
+        first = _make_context([MockResponse(content="hi")])
+        first.cache_enabled = True
+        first.conversation = [{"role": "user", "content": "hello"}]
+        run(first)
+
+        second = _make_context([MockResponse(content="hi again")])
+        second.cache_enabled = True
+        second.conversation = [{"role": "user", "content": "hello"}]
+
+        assert run(second) == "hi again"
+
+    def test_tool_call_replies_not_cached(self) -> None:
+        """Only final text replies are stored; tool-calling turns always rerun."""
+        tool = MockTool(name="file_read")
+        ctx = _make_context(
+            [
+                MockResponse(tool_calls=[_make_tool_call("file_read")]),
+                MockResponse(content="done"),
+            ],
+            tools={"file_read": tool},
+        )
+        ctx.cache_enabled = True
+        ctx.conversation = [{"role": "user", "content": "read it"}]
+
+        assert run(ctx) == "done"
+        assert len(_response_cache) == 1
+        assert all(not result.tool_calls for _, result in _response_cache.values())
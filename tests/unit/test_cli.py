@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,6 +18,24 @@ class TestCliVersion:
         captured = capsys.readouterr()
         assert captured.out.startswith("zhi ")
 
+    def test_version_flag_skips_parser(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        from zhi.cli import main
+
+        with patch("zhi.cli._build_parser") as mock_build:
+            main(["--version"])
+        mock_build.assert_not_called()
+        assert capsys.readouterr().out.startswith("zhi ")
+
+    def test_version_with_other_flags_still_parsed(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        from zhi.cli import main
+
+        main(["--debug", "--version"])
+        assert capsys.readouterr().out.startswith("zhi ")
+
     def test_help_flag(self) -> None:
         from zhi.cli import main
 
@@ -70,10 +89,73 @@ class TestCliOneShot:
             captured = capsys.readouterr()
             assert "No API key" in captured.out
 
+    @pytest.mark.parametrize(("flags", "tools"), [([], True), (["--no-tools"], False)])
+    def test_oneshot_no_tools_flag(self, flags: list[str], tools: bool) -> None:
+        from zhi.cli import main
+
+        with (
+            patch("zhi.config.load_config") as mock_cfg,
+            patch("zhi.ui.UI"),
+            patch("zhi.cli._run_oneshot") as mock_oneshot,
+        ):
+            mock_cfg.return_value = MagicMock(
+                has_api_key=True, log_level="INFO", language="auto"
+            )
+            main([*flags, "-c", "hello"])
+
+        assert mock_oneshot.call_args.kwargs == {"tools": tools}
+
+    @pytest.mark.parametrize("argv", [["--no-tools"], ["--no-tools", "run", "demo"]])
+    def test_no_tools_rejected_outside_oneshot_and_pipe(
+        self, argv: list[str], capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """The REPL and skill runs need tools, so the flag is an error there."""
+        from zhi.cli import main
+
+        with (
+            patch("zhi.config.load_config") as mock_cfg,
+            patch("zhi.ui.UI"),
+            patch("zhi.cli._maybe_check_update"),
+            patch("zhi.cli._run_repl") as mock_repl,
+            patch("zhi.cli._run_skill") as mock_skill,
+            patch("sys.stdin") as mock_stdin,
+        ):
+            mock_stdin.isatty.return_value = True
+            mock_cfg.return_value = MagicMock(
+                has_api_key=True, log_level="INFO", language="auto"
+            )
+            with pytest.raises(SystemExit) as exc_info:
+                main(argv)
+
+        assert exc_info.value.code == 2
+        assert "--no-tools" in capsys.readouterr().err
+        mock_repl.assert_not_called()
+        mock_skill.assert_not_called()
+
 
 class TestCliSkillRun:
     """Test 'run' subcommand."""
 
+    def test_run_with_files_builds_one_client(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from zhi.cli import main
+        from zhi.config import ZhiConfig
+
+        monkeypatch.delenv("ZHI_API_KEY", raising=False)
+        notes = tmp_path / "notes.txt"
+        notes.write_text("hello")
+        config = ZhiConfig(api_key="sk-test", output_dir=str(tmp_path / "out"))
+        with (
+            patch("zhi.config.load_config", return_value=config),
+            patch("zhi.client.Client") as mock_client_cls,
+            patch("zhi.agent.run", return_value="done"),
+        ):
+            main(["run", "pdf", str(notes)])
+
+        # File extraction and the agent share a single API client
+        mock_client_cls.assert_called_once()
+
     def test_run_requires_api_key(
         self, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -142,6 +224,44 @@ class TestCliBuildContext:
         assert ctx.conversation[0]["role"] == "system"
         assert ctx.conversation[1]["role"] == "user"
 
+    def test_build_context_reuses_given_skills(self) -> None:
+        from zhi.cli import _build_context
+        from zhi.config import ZhiConfig
+
+        config = ZhiConfig(api_key="sk-test")
+        ui = MagicMock()
+
+        with (
+            patch("zhi.client.Client") as mock_client_cls,
+            patch("zhi.skills.discover_skills") as mock_discover,
+        ):
+            mock_client_cls.return_value = MagicMock()
+            ctx = _build_context(config, ui, skills={})
+
+        mock_discover.assert_not_called()
+        assert "file_read" in ctx.tools
+
+    def test_build_context_without_tools_skips_registry(self) -> None:
+        from zhi.cli import _build_context
+        from zhi.config import ZhiConfig
+
+        config = ZhiConfig(api_key="sk-test")
+        ui = MagicMock()
+
+        with (
+            patch("zhi.client.Client") as mock_client_cls,
+            patch("zhi.skills.discover_skills") as mock_discover,
+            patch("zhi.tools.create_default_registry") as mock_registry,
+        ):
+            mock_client_cls.return_value = MagicMock()
+            ctx = _build_context(config, ui, tool_names=[], user_message="hi")
+
+        mock_discover.assert_not_called()
+        mock_registry.assert_not_called()
+        assert len(ctx.tools) == 0
+        assert ctx.tool_schemas == []
+        assert ctx.conversation == [{"role": "user", "content": "hi"}]
+
 
 class TestCliUpdate:
     """Test 'update' subcommand."""
@@ -304,3 +424,46 @@ class TestRequireApiKey:
         assert _require_api_key(config) is False
         captured = capsys.readouterr()
         assert "No API key" in captured.out
+
+
+class TestSetupLogging:
+    """Test _setup_logging helper."""
+
+    def test_second_call_only_changes_level(self) -> None:
+        import logging
+
+        from zhi.cli import _setup_logging
+
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        try:
+            root.handlers = []
+            _setup_logging()
+            handlers = root.handlers[:]
+            assert root.level == logging.WARNING
+
+            _setup_logging(config_level="info")
+            assert root.handlers == handlers
+            assert root.level == logging.INFO
+
+            _setup_logging(debug=True, config_level="error")
+            assert root.handlers == handlers
+            assert root.level == logging.DEBUG
+        finally:
+            root.handlers = saved_handlers
+            root.setLevel(saved_level)
+
+    @pytest.mark.parametrize("name", ["verbose", "basic_format", "Logger", ""])
+    def test_unknown_level_falls_back_to_warning(self, name: str) -> None:
+        import logging
+
+        from zhi.cli import _setup_logging
+
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        try:
+            _setup_logging(config_level=name)
+            assert root.level == logging.WARNING
+        finally:
+            root.handlers = saved_handlers
+            root.setLevel(saved_level)
@@ -5,6 +5,8 @@ All tests mock at the SDK boundary (zhipuai.ZhipuAI), never at HTTP level.
 
 from __future__ import annotations
 
+import subprocess
+import sys
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -17,6 +19,7 @@ from zhi.client import (
     ChatResponse,
     Client,
     ClientError,
+    RateLimitError,
     ServerError,
 )
 
@@ -101,6 +104,8 @@ class TestChatCompletion:
         assert result.total_tokens == 30
         assert result.finish_reason == "stop"
         assert result.tool_calls == []
+        assert result.raw is mock_sdk.chat.completions.create.return_value
+        assert "raw=" not in repr(result)
 
     @patch("zhi.client.ZhipuAI")
     def test_chat_completion_with_tools(self, mock_sdk_cls: MagicMock) -> None:
@@ -155,6 +160,32 @@ class TestChatCompletion:
         assert result_chunks[2].delta_content == "!"
         assert result_chunks[2].finish_reason == "stop"
 
+    @patch("zhi.client.ZhipuAI")
+    def test_chat_stream_close_releases_response(self, mock_sdk_cls: MagicMock) -> None:
+        """Closing the stream early closes the SDK's underlying HTTP response."""
+
+        class FakeStreamResponse:
+            def __init__(self, chunks: list[Any]) -> None:
+                self.response = MagicMock()
+                self._chunks = chunks
+
+            def __iter__(self) -> Any:
+                return iter(self._chunks)
+
+        sdk_stream = FakeStreamResponse(
+            [_make_stream_chunk("Hello"), _make_stream_chunk(" world")]
+        )
+        mock_sdk_cls.return_value.chat.completions.create.return_value = sdk_stream
+
+        client = Client(api_key="sk-test")
+        stream = client.chat_stream(messages=[{"role": "user", "content": "hi"}])
+        assert next(stream).delta_content == "Hello"
+        sdk_stream.response.close.assert_not_called()
+
+        stream.close()
+
+        sdk_stream.response.close.assert_called_once_with()
+
     @patch("zhi.client.ZhipuAI")
     def test_chat_invalid_api_key(self, mock_sdk_cls: MagicMock) -> None:
         mock_sdk = mock_sdk_cls.return_value
@@ -176,6 +207,7 @@ class TestChatCompletion:
         mock_time: MagicMock,
     ) -> None:
         mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
 
         mock_sdk = mock_sdk_cls.return_value
         rate_error = Exception("rate limit exceeded")
@@ -203,6 +235,7 @@ class TestChatCompletion:
         mock_time: MagicMock,
     ) -> None:
         mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
 
         mock_sdk = mock_sdk_cls.return_value
         server_error = Exception("server error")
@@ -228,6 +261,7 @@ class TestChatCompletion:
         mock_time: MagicMock,
     ) -> None:
         mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
 
         mock_sdk = mock_sdk_cls.return_value
         server_error = Exception("server error")
@@ -241,6 +275,115 @@ class TestChatCompletion:
                 messages=[{"role": "user", "content": "hi"}],
             )
 
+    @patch("zhi.client.time")
+    @patch("zhi.client.ZhipuAI")
+    def test_chat_retry_honors_retry_after(
+        self,
+        mock_sdk_cls: MagicMock,
+        mock_time: MagicMock,
+    ) -> None:
+        mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
+
+        rate_error = Exception("rate limit exceeded")
+        rate_error.status_code = 429  # type: ignore[attr-defined]
+        rate_error.response = SimpleNamespace(  # type: ignore[attr-defined]
+            headers={"retry-after": "7"}
+        )
+        mock_sdk = mock_sdk_cls.return_value
+        mock_sdk.chat.completions.create.side_effect = [
+            rate_error,
+            _make_response("OK"),
+        ]
+
+        client = Client(api_key="sk-test", max_retries=3)
+        client.chat(messages=[{"role": "user", "content": "hi"}])
+
+        mock_time.sleep.assert_called_once_with(7.0)
+
+    @patch("zhi.client.time")
+    @patch("zhi.client.ZhipuAI")
+    def test_chat_retry_stops_at_timeout_budget(
+        self,
+        mock_sdk_cls: MagicMock,
+        mock_time: MagicMock,
+    ) -> None:
+        mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
+
+        rate_error = Exception("rate limit exceeded")
+        rate_error.status_code = 429  # type: ignore[attr-defined]
+        rate_error.response = SimpleNamespace(  # type: ignore[attr-defined]
+            headers={"retry-after": "20"}
+        )
+        mock_sdk = mock_sdk_cls.return_value
+        mock_sdk.chat.completions.create.side_effect = rate_error
+
+        client = Client(api_key="sk-test", max_retries=3, timeout=10.0)
+        with pytest.raises(RateLimitError):
+            client.chat(messages=[{"role": "user", "content": "hi"}])
+
+        mock_time.sleep.assert_not_called()
+        assert mock_sdk.chat.completions.create.call_count == 1
+
+    @patch("zhi.client.time")
+    @patch("zhi.client.ZhipuAI")
+    def test_chat_retry_budget_starts_at_first_failure(
+        self,
+        mock_sdk_cls: MagicMock,
+        mock_time: MagicMock,
+    ) -> None:
+        """A call that fails after longer than the timeout is still retried."""
+        clock = [0.0]
+        mock_time.monotonic.side_effect = lambda: clock[0]
+        mock_time.sleep = MagicMock()
+
+        server_error = Exception("server error")
+        server_error.status_code = 500  # type: ignore[attr-defined]
+        responses = iter([server_error, _make_response("OK")])
+
+        def slow_create(**kwargs: Any) -> Any:
+            clock[0] += 61.0
+            outcome = next(responses)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        mock_sdk = mock_sdk_cls.return_value
+        mock_sdk.chat.completions.create.side_effect = slow_create
+
+        client = Client(api_key="sk-test", max_retries=3, timeout=60.0)
+        result = client.chat(messages=[{"role": "user", "content": "hi"}])
+
+        assert result.content == "OK"
+        assert mock_sdk.chat.completions.create.call_count == 2
+
+    @patch("zhi.client.time")
+    @patch("zhi.client.ZhipuAI")
+    def test_chat_retry_waits_use_decorrelated_jitter(
+        self,
+        mock_sdk_cls: MagicMock,
+        mock_time: MagicMock,
+    ) -> None:
+        mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
+
+        server_error = Exception("server error")
+        server_error.status_code = 500  # type: ignore[attr-defined]
+        mock_sdk = mock_sdk_cls.return_value
+        mock_sdk.chat.completions.create.side_effect = server_error
+
+        client = Client(api_key="sk-test", max_retries=5, timeout=1000.0)
+        with pytest.raises(ServerError):
+            client.chat(messages=[{"role": "user", "content": "hi"}])
+
+        waits = [c.args[0] for c in mock_time.sleep.call_args_list]
+        assert len(waits) == 5
+        prev = 1.0
+        for wait in waits:
+            assert 1.0 <= wait <= min(prev * 3, 30.0)
+            prev = wait
+
     @patch("zhi.client.ZhipuAI")
     def test_chat_network_timeout(self, mock_sdk_cls: MagicMock) -> None:
         mock_sdk = mock_sdk_cls.return_value
@@ -287,6 +430,37 @@ class TestChatChunkParsing:
         assert len(chunks) == 1
         assert chunks[0].delta_content == ""
 
+    @patch("zhi.client.ZhipuAI")
+    def test_tool_call_deltas(self, mock_sdk_cls: MagicMock) -> None:
+        start = SimpleNamespace(
+            index=0,
+            id="call_1",
+            function=SimpleNamespace(name="file_read", arguments=None),
+        )
+        no_fn = SimpleNamespace(index=1, id=None, function=None)
+        mock_sdk = mock_sdk_cls.return_value
+        mock_sdk.chat.completions.create.return_value = iter(
+            [_make_stream_chunk(tool_calls=[start, no_fn])]
+        )
+
+        client = Client(api_key="sk-test")
+        (chunk,) = client.chat_stream(messages=[{"role": "user", "content": "hi"}])
+
+        assert chunk.tool_calls == [
+            {
+                "index": 0,
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "file_read", "arguments": None},
+            },
+            {
+                "index": 1,
+                "id": None,
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            },
+        ]
+
 
 class TestValidateKey:
     """Test API key validation."""
@@ -318,6 +492,7 @@ class TestValidateKey:
     ) -> None:
         """Non-auth errors (server error) mean key is valid."""
         mock_time.sleep = MagicMock()
+        mock_time.monotonic.return_value = 0.0
         mock_sdk = mock_sdk_cls.return_value
         error = Exception("server error")
         error.status_code = 500  # type: ignore[attr-defined]
@@ -368,6 +543,19 @@ class TestOCR:
         with pytest.raises(ClientError):
             client.ocr(Path("/nonexistent/file.pdf"))
 
+    @patch("zhi.client.ZhipuAI")
+    def test_unsupported_format_rejected_before_stat(
+        self, mock_sdk_cls: MagicMock
+    ) -> None:
+        client = Client(api_key="sk-test")
+        with (
+            patch.object(Path, "exists") as mock_exists,
+            pytest.raises(ClientError) as exc_info,
+        ):
+            client.file_extract(Path("/nonexistent/notes.txt"))
+        assert exc_info.value.code == "UNSUPPORTED_FORMAT"
+        mock_exists.assert_not_called()
+
     @patch("zhi.client.ZhipuAI")
     def test_file_extract_oserror_on_exists(
         self, mock_sdk_cls: MagicMock, tmp_path: Path
@@ -550,3 +738,41 @@ class TestErrorClassification:
 
         assert not isinstance(classified, RateLimitError)
         assert classified.code == "CLIENT_ERROR"
+
+    @pytest.mark.parametrize(
+        ("message", "status", "expected_code"),
+        [
+            ("Connection timed out", None, "TIMEOUT"),
+            ("Unauthorized", 500, "AUTH_ERROR"),
+            ("RATE LIMIT reached, server error", None, "RATE_LIMIT"),
+            ("upstream connection reset", 503, "SERVER_ERROR"),
+            ("Invalid API key provided", None, "AUTH_ERROR"),
+        ],
+    )
+    def test_classification_precedence(
+        self, message: str, status: int | None, expected_code: str
+    ) -> None:
+        with patch("zhi.client.ZhipuAI"):
+            client = Client(api_key="sk-test", max_retries=0)
+        error = Exception(message)
+        error.status_code = status  # type: ignore[attr-defined]
+        assert client._classify_error(error).code == expected_code
+
+
+class TestLazySdkImport:
+    def test_importing_zhi_does_not_import_sdk(self) -> None:
+        code = (
+            "import sys, zhi.client, zhi.cli; "
+            "assert 'zhipuai' not in sys.modules, 'zhipuai imported eagerly'"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        assert proc.returncode == 0, proc.stderr
+
+    def test_sdk_class_resolved_on_attribute_access(self) -> None:
+        import zhipuai
+
+        import zhi.client
+
+        assert zhi.client.ZhipuAI is zhipuai.ZhipuAI
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import stat
+import subprocess
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -209,6 +210,42 @@ class TestSaveConfig:
         assert not (mode & stat.S_IRGRP)  # Group cannot read
         assert not (mode & stat.S_IROTH)  # Others cannot read
 
+    @pytest.mark.skipif(
+        sys.platform == "win32",
+        reason="Unix file permissions (chmod 0o600) not supported on Windows",
+    )
+    def test_save_config_tightens_existing_file(self, tmp_path: Path) -> None:
+        existing = tmp_path / "config.yaml"
+        existing.write_text("api_key: old\n")
+        existing.chmod(0o644)
+
+        path = save_config(ZhiConfig(api_key="sk-test"), config_dir=tmp_path)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert yaml.safe_load(path.read_text())["api_key"] == "sk-test"
+
+    @pytest.mark.skipif(
+        sys.platform == "win32",
+        reason="Unix file permissions (chmod 0o600) not supported on Windows",
+    )
+    def test_save_config_chmod_failure_warns(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with patch("zhi.config.os.fchmod", side_effect=OSError("EPERM")):
+            path = save_config(ZhiConfig(api_key="sk-test"), config_dir=tmp_path)
+
+        assert path.exists()
+        assert "Could not set restrictive permissions" in caplog.text
+
+    def test_save_config_dump_failure_keeps_existing_file(self, tmp_path: Path) -> None:
+        existing = tmp_path / "config.yaml"
+        existing.write_text("api_key: sk-old\n")
+
+        with pytest.raises(yaml.YAMLError):
+            save_config(ZhiConfig(output_dir=object()), config_dir=tmp_path)  # type: ignore[arg-type]
+
+        assert existing.read_text() == "api_key: sk-old\n"
+
     def test_save_config_returns_path(self, tmp_path: Path) -> None:
         cfg = ZhiConfig(api_key="sk-test")
         path = save_config(cfg, config_dir=tmp_path)
@@ -241,6 +278,35 @@ class TestGetConfigDir:
         assert isinstance(result, Path)
         assert "zhi" in str(result)
 
+    @pytest.mark.skipif(sys.platform != "linux", reason="XDG paths are Linux-only")
+    def test_get_config_dir_cached_until_cleared(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        get_config_dir.cache_clear()
+        try:
+            monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "a"))
+            first = get_config_dir()
+            monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "b"))
+            assert get_config_dir() is first
+
+            get_config_dir.cache_clear()
+            assert get_config_dir() == tmp_path / "b" / "zhi"
+        finally:
+            get_config_dir.cache_clear()
+
+
+class TestLazyImports:
+    def test_importing_config_does_not_import_yaml(self) -> None:
+        code = (
+            "import sys, zhi.config; "
+            "assert 'yaml' not in sys.modules, 'yaml imported eagerly'; "
+            "assert 'platformdirs' not in sys.modules, 'platformdirs imported eagerly'"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        assert proc.returncode == 0, proc.stderr
+
 
 class TestWizardDemo:
     """Test wizard demo Step 3 behavior."""
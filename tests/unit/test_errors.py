@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 
 class TestZhiError:
     """Test structured error types and formatting."""
@@ -123,3 +125,29 @@ class TestZhiError:
         for code, error in ERROR_CATALOG.items():
             assert isinstance(error, ZhiError), f"{code} is not a ZhiError"
             assert error.code == code, f"{code} code mismatch"
+
+    def test_error_survives_copy(self) -> None:
+        import copy
+
+        from zhi.errors import ApiError
+
+        error = copy.copy(ApiError("m", code="X", suggestions=["a"]))
+        assert error.code == "X"
+        assert error.suggestions == ["a"]
+
+    def test_error_survives_pickle(self) -> None:
+        import pickle
+
+        from zhi.errors import ApiError
+
+        error = pickle.loads(pickle.dumps(ApiError("m", code="X", suggestions=["a"])))
+        assert isinstance(error, ApiError)
+        assert error.message == "m"
+        assert error.code == "X"
+        assert error.suggestions == ["a"]
+
+    def test_error_catalog_is_read_only(self) -> None:
+        from zhi.errors import ERROR_CATALOG, ApiError
+
+        with pytest.raises(TypeError):
+            ERROR_CATALOG["AUTH_INVALID_KEY"] = ApiError("x")  # type: ignore[index]
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -72,6 +74,21 @@ class TestFindFilePaths:
         paths = find_file_paths(text)
         assert paths == [f]
 
+    def test_path_directly_after_chinese_text(self, tmp_path: Path) -> None:
+        f = tmp_path / "data.csv"
+        f.write_text("a,b")
+        assert find_file_paths(f"请读取{f} 谢谢") == [f]
+
+    def test_path_followed_by_ideographic_space(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.txt"
+        f.write_text("hi")
+        assert find_file_paths(f"请看 {f}\u3000谢谢") == [f]
+
+    def test_path_followed_by_no_break_space(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.txt"
+        f.write_text("hi")
+        assert find_file_paths(f"see {f}\u00a0please") == [f]
+
     def test_no_extension_not_matched(self, tmp_path: Path) -> None:
         d = tmp_path / "somedir"
         d.mkdir()
@@ -79,25 +96,49 @@ class TestFindFilePaths:
         paths = find_file_paths(text)
         assert paths == []
 
+    def test_non_canonical_path_kept_as_written(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        f = tmp_path / "notes.txt"
+        f.write_text("hi")
+        written = f"{tmp_path}/sub/../notes.txt"
+
+        cleaned, attachments = extract_files(f"read {written} now", MagicMock())
+
+        assert attachments[0].path == Path(written)
+        assert cleaned == "read [File 1: notes.txt] now"
+
+    def test_directory_with_extension_not_matched(self, tmp_path: Path) -> None:
+        d = tmp_path / "archive.d"
+        d.mkdir()
+        assert find_file_paths(f"look at {d}") == []
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+    def test_symlink_deduplicated_to_target(self, tmp_path: Path) -> None:
+        f = tmp_path / "data.csv"
+        f.write_text("a,b")
+        link = tmp_path / "link.csv"
+        link.symlink_to(f)
+        assert find_file_paths(f"{f} and {link}") == [f]
+
     def test_url_not_matched(self) -> None:
         text = "visit https://example.com/page.html"
         paths = find_file_paths(text)
         assert paths == []
 
     def test_is_file_oserror_skipped(self, tmp_path: Path) -> None:
-        """Bug 7: OSError on is_file() should not crash find_file_paths."""
+        """Bug 7: OSError checking the file should not crash find_file_paths."""
         f = tmp_path / "network.xlsx"
         f.write_bytes(b"data")
         text = f"read {f}"
 
-        orig_is_file = Path.is_file
+        orig_stat = os.stat
 
-        def patched_is_file(self_path: Path) -> bool:
-            if self_path.name == "network.xlsx":
+        def patched_stat(path: Any, *args: Any, **kwargs: Any) -> os.stat_result:
+            if str(path).endswith("network.xlsx"):
                 raise OSError("Network timeout")
-            return orig_is_file(self_path)
+            return orig_stat(path, *args, **kwargs)
 
-        with patch.object(Path, "is_file", patched_is_file):
+        with patch("zhi.files.os.stat", patched_stat):
             paths = find_file_paths(text)
 
         assert paths == []  # Skipped gracefully, no crash
@@ -122,6 +163,36 @@ class TestExtractFiles:
         assert "[File 1: notes.txt]" in cleaned
         client.file_extract.assert_not_called()
 
+    def test_large_utf8_file_cut_on_char_boundary(self, tmp_path: Path) -> None:
+        f = tmp_path / "big.md"
+        # 3-byte characters, far past the read budget
+        f.write_text("\u4e2d" * 200_000, encoding="utf-8")
+
+        _, attachments = extract_files(f"read {f}", MagicMock())
+
+        content = attachments[0].content
+        head, _, note = content.partition("\n[truncated")
+        assert head == "\u4e2d" * (50 * 1024)
+        assert "of 585.9KB]" in note
+
+    def test_large_file_within_read_budget_reports_kb(self, tmp_path: Path) -> None:
+        f = tmp_path / "medium.txt"
+        f.write_text("a" * (60 * 1024))
+
+        _, attachments = extract_files(f"read {f}", MagicMock())
+
+        assert attachments[0].content.endswith(
+            "\n[truncated, showing first 50KB of 60.0KB]"
+        )
+
+    def test_large_latin1_file_still_falls_back(self, tmp_path: Path) -> None:
+        f = tmp_path / "big.txt"
+        f.write_bytes(b"\xe9" * 300_000)
+
+        _, attachments = extract_files(f"read {f}", MagicMock())
+
+        assert attachments[0].content.startswith("\xe9" * (50 * 1024) + "\n[truncated")
+
     def test_xlsx_uses_file_extract(self, tmp_path: Path) -> None:
         f = tmp_path / "prices.xlsx"
         f.write_bytes(b"PK data")
@@ -150,6 +221,47 @@ class TestExtractFiles:
         assert "[File 1:" in cleaned
         assert "[File 2:" in cleaned
 
+    def test_multiple_files_extracted_concurrently_in_order(
+        self, tmp_path: Path
+    ) -> None:
+        import threading
+
+        files = [tmp_path / f"{name}.pdf" for name in ("a", "b", "c")]
+        for f in files:
+            f.write_bytes(b"data")
+        # Every call waits until all three are in flight at once
+        barrier = threading.Barrier(len(files), timeout=5)
+        client = MagicMock()
+
+        def extract(path: Path) -> str:
+            barrier.wait()
+            return f"content of {path.name}"
+
+        client.file_extract.side_effect = extract
+
+        text = "read " + " ".join(str(f) for f in files)
+        _cleaned, attachments = extract_files(text, client)
+
+        assert [a.content for a in attachments] == [
+            "content of a.pdf",
+            "content of b.pdf",
+            "content of c.pdf",
+        ]
+        assert all(a.error is None for a in attachments)
+
+    def test_text_only_batch_read_without_pool(self, tmp_path: Path) -> None:
+        files = [tmp_path / f"{name}.txt" for name in ("a", "b")]
+        for f in files:
+            f.write_text(f.stem)
+
+        with patch("zhi.files.ThreadPoolExecutor") as pool:
+            _cleaned, attachments = extract_files(
+                " ".join(str(f) for f in files), MagicMock()
+            )
+
+        pool.assert_not_called()
+        assert [a.content for a in attachments] == ["a", "b"]
+
     def test_nonexistent_file_left_in_text(self) -> None:
         client = MagicMock()
         text = "read /nonexistent/file.xlsx"
@@ -89,6 +89,22 @@ class TestLanguageResolution:
         monkeypatch.setenv("LC_ALL", "zh_TW.UTF-8")
         assert resolve_language() == "zh"
 
+    def test_resolution_cached_until_set_language(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        set_language("auto")
+        monkeypatch.setenv("ZHI_LANGUAGE", "zh")
+        assert resolve_language() == "zh"
+
+        monkeypatch.setenv("ZHI_LANGUAGE", "en")
+        monkeypatch.delenv("LANG", raising=False)
+        monkeypatch.delenv("LC_ALL", raising=False)
+        monkeypatch.setattr("zhi.i18n._get_system_locale", lambda: None)
+        assert resolve_language() == "zh"  # env is not re-read
+
+        set_language("auto")
+        assert resolve_language() == "en"
+
     def test_explicit_overrides_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
         set_language("en")
         monkeypatch.setenv("ZHI_LANGUAGE", "zh")
@@ -123,11 +139,25 @@ class TestTranslation:
         result = t("repl.model_switched", model="glm-5")
         assert "glm-5" in result
 
+    def test_t_missing_format_arg_returns_template(self) -> None:
+        set_language("en")
+        try:
+            assert t("repl.model_switched", other="x") == "Model switched to {model}"
+        finally:
+            set_language("auto")
+
     def test_t_falls_back_to_english(self) -> None:
         set_language("zh")
         # Even if a key is missing in zh, it should fall back to en
         set_language("auto")  # Reset
 
+    def test_t_unknown_language_uses_english(self) -> None:
+        set_language("fr")
+        try:
+            assert t("repl.goodbye") == "Goodbye!"
+        finally:
+            set_language("auto")
+
     def test_t_returns_key_for_unknown(self, monkeypatch: pytest.MonkeyPatch) -> None:
         set_language("auto")
         monkeypatch.delenv("ZHI_LANGUAGE", raising=False)
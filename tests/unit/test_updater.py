@@ -205,6 +205,43 @@ class TestCheckForUpdate:
         assert cached is not None
         assert cached["version"] == "1.5.0"
 
+    def test_background_serves_stale_cache_and_refreshes(self, tmp_path: Path) -> None:
+        path = tmp_path / "update_cache.json"
+        path.write_text(
+            json.dumps({"version": "2.0.0", "checked_at": time.time() - 100_000})
+        )
+        with (
+            patch("zhi.updater._fetch_latest_version_pypi", return_value="3.0.0"),
+            patch("zhi.updater.threading.Thread") as mock_thread,
+        ):
+            result = check_for_update("1.0.0", config_dir=tmp_path, background=True)
+            # Run the refresh the way the daemon thread would
+            kwargs = mock_thread.call_args.kwargs
+            kwargs["target"](*kwargs["args"])
+        mock_thread.return_value.start.assert_called_once()
+        assert result is not None
+        assert result["latest"] == "2.0.0"
+        cached = _read_cache(config_dir=tmp_path)
+        assert cached is not None
+        assert cached["version"] == "3.0.0"
+
+    def test_background_without_cache_does_not_block(self, tmp_path: Path) -> None:
+        with (
+            patch("zhi.updater._fetch_latest_version_pypi") as mock_fetch,
+            patch("zhi.updater.threading.Thread") as mock_thread,
+        ):
+            result = check_for_update("1.0.0", config_dir=tmp_path, background=True)
+        assert result is None
+        mock_fetch.assert_not_called()
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_background_fresh_cache_starts_no_thread(self, tmp_path: Path) -> None:
+        _write_cache("2.0.0", config_dir=tmp_path)
+        with patch("zhi.updater.threading.Thread") as mock_thread:
+            result = check_for_update("1.0.0", config_dir=tmp_path, background=True)
+        mock_thread.assert_not_called()
+        assert result is not None
+
 
 # ---------------------------------------------------------------------------
 # is_frozen
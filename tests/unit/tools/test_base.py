@@ -87,3 +87,11 @@ class TestBaseToolExecute:
         tool = DummyTool()
         result = tool.execute()
         assert result == "echo: "
+
+
+class TestBuiltinToolSlots:
+    def test_builtin_tools_have_no_instance_dict(self) -> None:
+        from zhi.tools import create_default_registry
+
+        for tool in create_default_registry().list_tools():
+            assert not hasattr(tool, "__dict__"), tool.name